@@ -0,0 +1,90 @@
+"""Correctness corpus for the attributedBody decoder.
+
+Every case is an attributedBody blob laid out as Messages archives it,
+and the text decode_attributed_body must return for it. Run this file to
+check the decoder against the corpus:
+
+    python benchmarks/attributed_body_corpus.py
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from model.text_collection.attributed_body import decode_attributed_body  # noqa: E402
+
+# Archive header up to the class chain of the message string
+_HEADER = (b"\x04\x0bstreamtyped\x81\xe8\x03\x84\x01@\x84\x84\x84\x12NSAttributedString\x00"
+           b"\x84\x84\x08NSObject\x00\x85\x92\x84\x84\x84")
+# Attribute runs and dictionary that follow the string
+_TRAILER = (b"\x86\x84\x02iI\x01\x05\x92\x84\x84\x84\x0cNSDictionary\x00\x94\x84\x01i\x01\x92\x84\x96\x96"
+            b"\x1d__kIMMessagePartAttributeName\x86\x92\x84\x84\x84\x08NSNumber\x00\x84\x84\x07NSValue"
+            b"\x00\x94\x84\x01*\x84\x99\x99\x00\x86\x86\x86")
+
+
+def length_prefix(length: int) -> bytes:
+    """Encode a typedstream length: one byte below 0x80, else 0x81 + int16 or 0x82 + int32."""
+    if length < 0x80:
+        return bytes([length])
+    if length < 0x10000:
+        return b"\x81" + length.to_bytes(2, "little")
+    return b"\x82" + length.to_bytes(4, "little")
+
+
+def typedstream(text: bytes, class_chain: Tuple[bytes, ...] = (b"NSString",)) -> bytes:
+    """Build an attributedBody blob holding text, archived under the classes of class_chain."""
+    classes = b"\x84\x84".join(bytes([len(name)]) + name + b"\x01" for name in class_chain)
+    return _HEADER + classes + b"\x94\x84\x01+" + length_prefix(len(text)) + text + _TRAILER
+
+
+def _mutable_string_only(text: bytes) -> bytes:
+    """A blob whose string class is NSMutableString, with its NSString superclass archived by reference."""
+    return _HEADER + b"\x0fNSMutableString\x01\x94\x84\x01+" + length_prefix(len(text)) + text + _TRAILER
+
+
+_EMOJI_TEXT = "Café 😀 naïve – 日本語 ".encode() * 10
+_STRING_HEADER = b"\x08NSString\x01\x94\x84\x01+"
+
+# (description, blob, expected text)
+CORPUS: List[Tuple[str, Optional[bytes], str]] = [
+    ("None", None, ""),
+    ("empty blob", b"", ""),
+    ("empty string", typedstream(b""), ""),
+    ("short ASCII", typedstream(b"On my way!"), "On my way!"),
+    ("127 bytes, longest one-byte length", typedstream(b"a" * 127), "a" * 127),
+    ("128 bytes, shortest 0x81 length", typedstream(b"b" * 128), "b" * 128),
+    ("multi-byte UTF-8", typedstream(_EMOJI_TEXT), _EMOJI_TEXT.decode()),
+    ("65535 bytes, longest 0x81 length", typedstream(b"c" * 65535), "c" * 65535),
+    ("65536 bytes, shortest 0x82 length", typedstream(b"d" * 65536), "d" * 65536),
+    ("70000 bytes, 0x82 length", typedstream(b"e" * 70000), "e" * 70000),
+    ("NSMutableString with NSString superclass",
+     typedstream(b"edited", (b"NSMutableString", b"NSString")), "edited"),
+    ("NSMutableString only", _mutable_string_only(b"mutable text"), "mutable text"),
+    ("text containing '+'", typedstream(b"1+1=2 +44"), "1+1=2 +44"),
+    ("invalid UTF-8 is replaced", typedstream(b"ok\xff"), "ok�"),
+    ("no string class", b"\x04\x0bstreamtyped\x81\xe8\x03\x84\x01@", ""),
+    ("class name at end of blob", b"\x04\x0bstreamtyped\x84\x08NSString", ""),
+    ("no type code after class name", b"\x08NSString" + b"\x01" * 32, ""),
+    ("type code at end of blob", _STRING_HEADER, ""),
+    ("truncated 0x81 length", _STRING_HEADER + b"\x81\x05", ""),
+    ("truncated 0x82 length", _STRING_HEADER + b"\x82\x05\x00", ""),
+    ("length past end of blob", _STRING_HEADER + b"\x10abc", ""),
+    ("0x81 length past end of blob", _STRING_HEADER + b"\x81\x00\x01abc", ""),
+    ("unknown length tag", _STRING_HEADER + b"\x85abc", ""),
+]
+
+
+def check() -> List[str]:
+    """Return the descriptions of the corpus cases the decoder gets wrong."""
+    return [description for description, blob, expected in CORPUS
+            if decode_attributed_body(blob) != expected]
+
+
+if __name__ == "__main__":
+    failures = check()
+    for description in failures:
+        print(f"FAIL {description}")
+    print(f"{len(CORPUS) - len(failures)}/{len(CORPUS)} cases pass")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,144 @@
+"""Memory and attribute-access benchmark of the Contact, Chat and Message models.
+
+Compares the slotted models with the plain dataclasses they replaced, at
+10k chats and 1M messages:
+
+    python benchmarks/bench_models.py
+"""
+
+import gc
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from model.contacts_collection.contact import Contact  # noqa: E402
+from model.text_collection.chat import Chat  # noqa: E402
+from model.text_collection.message import Message  # noqa: E402
+
+CHATS = 10_000
+MESSAGES = 1_000_000
+REPEAT = 5
+
+
+@dataclass
+class DictContact:
+    """Contact as it was before it was slotted."""
+
+    phone_number: str
+    name: str
+
+
+@dataclass
+class DictChat:
+    """Chat as it was before it was slotted, recomputing chat_name on every access."""
+
+    chat_id: int
+    display_name: str
+    chat_identifier: str
+    members: List[DictContact]
+
+    @property
+    def chat_name(self) -> str:
+        if not self.display_name.startswith("chat"):
+            return self.display_name
+        elif len(self.members) > 1:
+            member_names = [member.name for member in self.members[:3]]
+            return ", ".join(member_names) + ("..." if len(self.members) > 3 else "")
+        elif len(self.members) == 1:
+            return self.members[0].name
+        else:
+            return self.chat_identifier
+
+
+@dataclass
+class DictMessage:
+    """Message as it was before it was slotted."""
+
+    row_id: int
+    guid: str
+    date: datetime
+    body: str
+    sender: DictContact
+    is_from_me: bool
+    has_attachments: bool
+    associated_message_guid: Optional[str] = None
+    associated_message_type: Optional[int] = None
+
+
+def make_chats(contact_class, chat_class) -> list:
+    """Build CHATS chats, most of them named after their members as unnamed group chats are."""
+    contacts = [contact_class(f"+1555{i:07d}", f"Contact {i}") for i in range(CHATS * 2)]
+    chats = []
+    for i in range(CHATS):
+        members = contacts[i:i + 1] if i % 3 else contacts[i:i + 5]
+        display_name = f"Group {i}" if i % 10 == 0 else f"chat{i}"
+        chats.append(chat_class(i, display_name, f"chat{i}", members))
+    return chats
+
+
+def make_messages(contact_class, message_class) -> list:
+    """Build MESSAGES messages sharing a few sender contacts, as messages read from chat.db do."""
+    senders = [contact_class(f"+1555{i:07d}", f"Contact {i}") for i in range(8)]
+    start = datetime(2024, 1, 1)
+    return [
+        message_class(i, f"guid-{i}", start + timedelta(seconds=i), f"message body {i}",
+                      senders[i % 8], bool(i % 2), False)
+        for i in range(MESSAGES)
+    ]
+
+
+def allocated_megabytes(build) -> float:
+    """Return the memory held by the objects build() returns, in MB."""
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size / 1e6
+
+
+def best_milliseconds(statement) -> float:
+    """Return the best of REPEAT runs of statement, in milliseconds."""
+    return min(timeit.repeat(statement, number=1, repeat=REPEAT)) * 1000
+
+
+def main() -> None:
+    print(f"Python {sys.version.split()[0]}")
+    rows = []
+
+    before = allocated_megabytes(lambda: make_messages(DictContact, DictMessage))
+    after = allocated_megabytes(lambda: make_messages(Contact, Message))
+    rows.append((f"{MESSAGES:,} Message objects", f"{before:.1f} MB", f"{after:.1f} MB"))
+
+    dict_messages = make_messages(DictContact, DictMessage)
+    slotted_messages = make_messages(Contact, Message)
+    before = best_milliseconds(lambda: [message.body for message in dict_messages])
+    after = best_milliseconds(lambda: [message.body for message in slotted_messages])
+    rows.append((f"reading .body on {MESSAGES:,} messages", f"{before:.1f} ms", f"{after:.1f} ms"))
+    del dict_messages, slotted_messages
+
+    before = allocated_megabytes(lambda: make_chats(DictContact, DictChat))
+    after = allocated_megabytes(lambda: make_chats(Contact, Chat))
+    rows.append((f"{CHATS:,} Chat objects and members", f"{before:.1f} MB", f"{after:.1f} MB"))
+
+    dict_chats = make_chats(DictContact, DictChat)
+    slotted_chats = make_chats(Contact, Chat)
+    before = best_milliseconds(lambda: [chat.chat_name for chat in dict_chats])
+    after = best_milliseconds(lambda: [chat.chat_name for chat in slotted_chats])
+    rows.append((f"chat_name on {CHATS:,} chats", f"{before:.2f} ms", f"{after:.2f} ms"))
+
+    width = max(len(label) for label, _, _ in rows)
+    print(f"{'':{width}}  {'before':>10}  {'after':>10}")
+    for label, before, after in rows:
+        print(f"{label:{width}}  {before:>10}  {after:>10}")
+
+
+if __name__ == "__main__":
+    main()
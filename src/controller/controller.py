@@ -1,5 +1,4 @@
 import os
-import time
 import subprocess
 import shutil
 from typing import List, Dict
@@ -7,7 +6,12 @@ from pathlib import Path
 from model.model import Model
 from view.view import View
 from model.text_collection.chat import Chat
+from model.text_collection.file_transfer import link_or_copy
 import threading
+from concurrent.futures import Future
+
+# Delay after the last keystroke before the chat list is filtered
+SEARCH_DEBOUNCE_MS = 120
 
 class Controller:
     """Controller class for managing interactions between Model and View."""
@@ -20,6 +24,9 @@ class Controller:
         self.export_dir = self._get_export_directory()
         self.all_chats = []
         self.current_export_files = []
+        self._pending_exports = 0
+        self._search_job = None
+        self._exported_paths: Dict[str, str] = {}
 
     def _get_export_directory(self) -> Path:
         """Get the path to the export directory in the user's Documents folder."""
@@ -41,13 +48,20 @@ class Controller:
         self._view.bind("<<SelectionComplete>>", self._on_selection_complete)
 
     def _on_search(self, event):
-        """Handle search bar input event."""
-        search_term = self._view.toolbar.get_search_var().get().lower()
-        if search_term:
-            filtered_chats = [chat for chat in self.all_chats if search_term in chat.lower()]
+        """Handle search bar input event, searching once typing pauses."""
+        if self._search_job is not None:
+            self._view.after_cancel(self._search_job)
+        self._search_job = self._view.after(SEARCH_DEBOUNCE_MS, self._run_search)
+
+    def _run_search(self):
+        """Filter the chat list with the current search term."""
+        self._search_job = None
+        search_term = self._view.toolbar.get_search_var().get()
+        if search_term and search_term != "Search...":
+            filtered_chats = self._model.search_chats(search_term)
         else:
             filtered_chats = self.all_chats.copy()
-        
+
         self._view.chat_list.display_chats(filtered_chats)
 
     def _on_selection_complete(self, event):
@@ -56,35 +70,41 @@ class Controller:
         self._view.settings.update_selected_chats(selected_chats)
 
     def _on_export_chat(self, event=None) -> None:
-        """Handle export chats process."""
+        """Handle export chats process, ignoring it while the previous export is still running."""
+        # A second run would write the same files, and its futures would share the pending count
+        if self._pending_exports:
+            return
         self._view.after(0, self._view.chat_view.start_loading_animation)
 
-        # Run the export process in a separate thread
-        export_thread = threading.Thread(target=self._run_export_process)
-        export_thread.start()
-
-    def _run_export_process(self):
-        displayed_chats = self._view.settings.get_displayed_chats()
-
-        # Fetch messages for all displayed chats
-        for chat_name in displayed_chats:
-            chat = self._model.get_chat(chat_name)
-            if chat:
-                self._model.text_collector.read_messages(
-                    chat.chat_identifier,
-                    self._model.contacts_collector.contacts_cache
-                )
-            else:
-                pass
-
-        # Wait for conversations to be populated
-        timeout = 120
-        self._wait_for_conversations(displayed_chats, timeout)
-
-        # After fetching messages, enable the save button, stop the loading animation, and show the message
-        self._view.after(0, self._view.settings.enable_save_button)
-        self._view.after(0, self._view.chat_view.stop_loading_animation)
-        self._view.after(0, self._view.chat_view.show_export_complete_message)
+        displayed_chats = self._model.get_displayed_chats(self._view.settings.get_displayed_chats())
+
+        # Export all displayed chats in the background; each future settles as soon as its chat is written
+        futures = self._model.text_collector.export_conversations(
+            displayed_chats,
+            self._model.contacts_collector.contacts_cache,
+            self._model.self_contact
+        )
+        self._pending_exports = len(futures)
+        if not futures:
+            self._on_exports_complete()
+        for chat_name, future in futures.items():
+            future.add_done_callback(
+                lambda f, name=chat_name: self._view.after(0, self._on_conversation_exported, name, f))
+
+    def _on_conversation_exported(self, chat_name: str, future: Future) -> None:
+        """Report the outcome of one chat's export and finish once every chat is done."""
+        if future.exception() is None:
+            self._exported_paths[chat_name] = future.result()
+        self._view.settings.set_export_status(chat_name, future.exception() is None)
+        self._pending_exports -= 1
+        if self._pending_exports == 0:
+            self._on_exports_complete()
+
+    def _on_exports_complete(self) -> None:
+        """Enable saving once every chat has been exported."""
+        self._view.settings.enable_save_button()
+        self._view.chat_view.stop_loading_animation()
+        self._view.chat_view.show_export_complete_message()
 
     def _on_save_export(self, event=None) -> None:
         """Handle saving the exported chats."""
@@ -131,9 +151,7 @@ class Controller:
         else:
             file_path = self.export_dir / subdir / filename
         if file_path.exists():
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-            self._view.chat_view.show_file_content(content)
+            self._view.chat_view.show_file(str(file_path))
             self._view.selected_exported_file = file_info
             self._view.settings.select_exported_file(file_info)
 
@@ -183,6 +201,7 @@ class Controller:
         self._view.settings.clear_messages()
 
         self._delete_folder("./conversations_selected")
+        self._exported_paths.clear()
 
         self._view.chat_list.clear_selection()
         self._view.chat_view.clear()
@@ -205,49 +224,23 @@ class Controller:
             else:
                 file_path = self.export_dir / subdir / filename
             if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                self._view.chat_view.show_file_content(content)
+                self._view.chat_view.show_file(str(file_path))
             else:
                 pass
 
-    def _wait_for_conversations(self, chat_names: List[str], timeout: int = 120) -> None:
-        """Wait for conversations to be populated in the conversations_selected folder."""
-        start_time = time.time()
-        conversations_folder = "./conversations_selected"
-
-        while time.time() - start_time < timeout:
-            all_conversations_ready = True
-            for chat_name in chat_names:
-                sanitized_name = self._sanitize_folder_name(chat_name)
-                chat_folder = os.path.join(conversations_folder, sanitized_name)
-                chat_file = os.path.join(chat_folder, f"{sanitized_name}.txt")
-
-                if not os.path.exists(chat_file):
-                    all_conversations_ready = False
-                    break
-                else:
-                    pass
-
-            if all_conversations_ready:
-                return
-
-            time.sleep(1)
-
-    def _sanitize_folder_name(self, name: str) -> str:
-        """Sanitize the folder name to match the one created by the text collector."""
-        return name.replace(', ', '_').replace(' ', '_').rstrip('...')
-
     def _export_chat(self, chat: Chat, output_dir: Path) -> Path:
-        """Export a single chat to a text file."""
+        """Place the exported text file of a chat in output_dir.
+
+        The file written by the export is hardlinked into place, so saving
+        does not write the conversation a second time.
+        """
         chat_filename = f"{chat.chat_name}.txt"
         chat_filepath = output_dir / chat_filename
 
-        sanitized_name = self._sanitize_folder_name(chat.chat_name)
-        source_file = Path("./conversations_selected") / sanitized_name / f"{sanitized_name}.txt"
+        source_file = self._exported_paths.get(chat.chat_name)
 
-        if source_file.exists():
-            shutil.copy(source_file, chat_filepath)
+        if source_file and os.path.exists(source_file):
+            link_or_copy(source_file, str(chat_filepath))
             return chat_filepath
         else:
             return None
@@ -270,12 +263,36 @@ class Controller:
         
         self._view.update_exported_files_list(exported_files)
 
-    def run(self) -> None:
-        """Load chats and start the main event loop."""
-        chats = self._model.get_chats()
+    def _refresh_chats_in_background(self) -> None:
+        """Rebuild the chat list on a worker thread and reconcile the view with it."""
+        def refresh():
+            chats = self._model.refresh_chats()
+            self._view.after(0, lambda: self._show_chats(chats))
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _show_chats(self, chats: List[Chat]) -> None:
+        """Replace the chat list, keeping the current search filter applied."""
         self.all_chats = [chat.chat_name for chat in chats]
         self._view.chat_list.set_all_chats(self.all_chats)
-        self._view.chat_list.display_chats(self.all_chats)
+        if self._view.toolbar.get_search_var().get() != "Search...":
+            self._run_search()
+
+    def run(self) -> None:
+        """Load chats and start the main event loop.
+
+        The chat list saved by the previous session is shown immediately and
+        rebuilt in the background if the database has changed since. The
+        rebuild starts once the event loop runs, since its worker hands the
+        result back through after(), which fails before mainloop().
+        """
+        chats, is_current = self._model.get_cached_chats()
+        if chats:
+            self._show_chats(chats)
+            if not is_current:
+                self._view.after_idle(self._refresh_chats_in_background)
+        else:
+            self._show_chats(self._model.get_chats())
         self._model.load_contacts()
 
         self._view.mainloop()
\ No newline at end of file
@@ -3,10 +3,13 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Contact:
     """Represents a contact with a phone number and name.
 
+    Contacts are immutable so a single instance can be shared by every chat
+    and message that refers to the same person.
+
     Attributes:
         phone_number: The contact's phone number as a string.
         name: The contact's name as a string.
@@ -1,11 +1,16 @@
-from typing import List
-from .text_collection.text_collector import TextCollector
+from typing import Dict, Iterator, List, Optional, Tuple
+from .text_collection.text_collector import TextCollector, DEFAULT_PAGE_SIZE
+from .text_collection.connection_pool import SnapshotConnectionPool
+from .text_collection.message_search_index import SearchHit
+from .text_collection.message_batch import MessageBatch
+from .text_collection.export_writer import EXPORT_WRITERS, ExportStats
 from .text_collection.chat import Chat
 from .text_collection.message import Message
 from .contacts_collection.contacts import ContactsCollector
 from .contacts_collection.contact import Contact
 import json
 from pathlib import Path
+from zoneinfo import ZoneInfo
 import os
 
 class Model:
@@ -26,8 +31,6 @@ class Model:
         Args:
             db_path: Path to the SQLite database file.
         """
-        self.text_collector = TextCollector(db_path)
-        self.contacts_collector = ContactsCollector()
         # Read self contact information from .hermes_config.json
         config_path = Path(__file__).parent.parent / ".hermes_config.json"
         with open(config_path, "r") as configFile:
@@ -35,6 +38,26 @@ class Model:
             self_phone_number = config["self"]["phone_number"]
             self_name = config["self"]["name"]
             self.self_contact = Contact(phone_number=self_phone_number, name=self_name)
+        # Optionally order the chat list from a sidecar index next to the config
+        activity_index_path = None
+        if config.get("chat_activity_index", False):
+            activity_index_path = str(config_path.parent / ".hermes_chat_activity.db")
+        # Optionally read from a snapshot ("memory" or "file") instead of the live database
+        pool = None
+        snapshot = config.get("snapshot")
+        if snapshot:
+            pool = SnapshotConnectionPool(db_path, in_memory=snapshot == "memory")
+        sync_state_path = str(config_path.parent / ".hermes_sync_state.json")
+        chat_list_cache_path = str(config_path.parent / ".hermes_chat_list_cache.json")
+        search_index_path = str(config_path.parent / ".hermes_search_index.db")
+        # Message dates are shown in UTC unless an IANA timezone is configured
+        timezone = ZoneInfo(config["timezone"]) if config.get("timezone") else None
+        # Number of chats exported at once when falling back to imessage-exporter
+        export_workers = config.get("export_workers")
+        self.text_collector = TextCollector(db_path, activity_index_path, pool, sync_state_path,
+                                            chat_list_cache_path, search_index_path, timezone,
+                                            export_workers)
+        self.contacts_collector = ContactsCollector()
         # Load all contacts
         self.load_contacts()
 
@@ -48,6 +71,24 @@ class Model:
         return self.text_collector.get_all_chat_ids_with_labels(
             self.contacts_collector.contacts_cache)
 
+    def get_cached_chats(self) -> Tuple[List[Chat], bool]:
+        """Retrieve the chat list saved by a previous session without querying the database.
+
+        Returns:
+            The cached Chat objects and whether they are still current.
+        """
+        return self.text_collector.load_cached_chats()
+
+    def refresh_chats(self) -> list[Chat]:
+        """Rebuild the chat list from the database and contacts.
+
+        Returns:
+            A list of Chat objects reflecting the current database.
+        """
+        self.contacts_collector.load_contacts()
+        return self.text_collector.get_all_chat_ids_with_labels(
+            self.contacts_collector.contacts_cache, refresh=True)
+
     def get_messages(self, chat_identifier: str) -> List[Message]:
         """Read messages for a specific chat.
 
@@ -68,6 +109,69 @@ class Model:
         except Exception:
             return []
 
+    def iter_messages(self, chat_identifier: str) -> Iterator[Message]:
+        """Stream messages for a specific chat without loading them all at once.
+
+        Args:
+            chat_identifier: The identifier of the chat to read messages from.
+
+        Returns:
+            An iterator of Message objects in date order.
+        """
+        return self.text_collector.iter_messages(
+            chat_identifier,
+            self.contacts_collector.contacts_cache,
+            self.self_contact
+        )
+
+    def get_message_batch(self, chat_identifier: str) -> MessageBatch:
+        """Read messages for a specific chat into a compact columnar batch.
+
+        Args:
+            chat_identifier: The identifier of the chat to read messages from.
+
+        Returns:
+            A MessageBatch holding every message of the chat in date order.
+        """
+        return self.text_collector.read_message_batch(
+            chat_identifier,
+            self.contacts_collector.contacts_cache,
+            self.self_contact
+        )
+
+    def sync(self) -> Dict[int, List[Message]]:
+        """Fetch the messages added since the last sync.
+
+        Returns:
+            A dictionary mapping chat IDs to their new Message objects in ROWID order.
+        """
+        return self.text_collector.sync(
+            self.contacts_collector.contacts_cache,
+            self.self_contact
+        )
+
+    def get_message_page(self, chat_id: int, before_rowid: Optional[int] = None,
+                         after_rowid: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE) -> List[Message]:
+        """Get one page of messages for a chat.
+
+        Args:
+            chat_id: The ROWID of the chat to read messages from.
+            before_rowid: Only return messages older than this message.
+            after_rowid: Only return messages newer than this message.
+            limit: The maximum number of messages to return.
+
+        Returns:
+            A list of Message objects in date order, the newest page if no bound is given.
+        """
+        return self.text_collector.get_message_page(
+            chat_id,
+            self.contacts_collector.contacts_cache,
+            self.self_contact,
+            before_rowid=before_rowid,
+            after_rowid=after_rowid,
+            limit=limit
+        )
+
     def get_chat_members(self, chat_identifier: str) -> List[Contact]:
         """Get the members of a specific chat.
 
@@ -125,22 +229,31 @@ class Model:
         """
         return [self.get_chat(chat_name) for chat_name in chat_names if self.get_chat(chat_name)]
 
-    def export_chats(self, chats: List[Chat], output_dir: str) -> None:
+    def export_chats(self, chats: List[Chat], output_dir: str, export_format: str = "txt",
+                     compress: bool = False) -> ExportStats:
         """
-        Export the given chats to text files in the specified output directory.
+        Export the given chats to files in the specified output directory.
+
+        All chats are written from one ordered scan of the database.
 
         Args:
             chats: List of Chat objects to export.
             output_dir: Directory to save the exported chat files.
-        """
-        for chat in chats:
-            messages = self.get_messages(chat.chat_identifier)
-            file_name = f"{chat.chat_name}.txt"
-            file_path = Path(output_dir) / file_name
+            export_format: "txt", "jsonl" or "csv".
+            compress: Whether to gzip the exported files.
 
-            with open(file_path, 'w', encoding='utf-8') as f:
-                for message in messages:
-                    f.write(f"{message.timestamp} - {message.sender}: {message.text}\n")
+        Returns:
+            The throughput of the export.
+        """
+        writer_class = EXPORT_WRITERS[export_format]
+        return self.text_collector.export_chats_in_single_pass(
+            chats,
+            lambda chat: str(Path(output_dir) / writer_class.file_name(chat.chat_name, compress)),
+            self.contacts_collector.contacts_cache,
+            self.self_contact,
+            export_format=export_format,
+            compress=compress
+        )
 
     def get_exported_files(self) -> List[str]:
         """Get a list of exported chat files."""
@@ -154,10 +267,22 @@ class Model:
         Search for chats based on the given search term.
 
         Args:
-            search_term: The term to search for in chat names.
+            search_term: The term to search for in chat names, member names and phone numbers.
+
+        Returns:
+            A list of chat names that match the search term, ranked by match quality and recency.
+        """
+        return [chat.chat_name for chat in self.text_collector.search_chats(search_term)]
+
+    def search_messages(self, query: str, limit: int = 50) -> List[SearchHit]:
+        """
+        Search the content of messages across every conversation.
+
+        Args:
+            query: The words to search for; the last one may be a prefix.
+            limit: The maximum number of hits to return.
 
         Returns:
-            A list of chat names that match the search term.
+            A list of SearchHit objects ranked by relevance.
         """
-        all_chats = self.get_chats()
-        return [chat.chat_name for chat in all_chats if search_term.lower() in chat.chat_name.lower()]
\ No newline at end of file
+        return self.text_collector.search_messages(query, self.self_contact, limit)
@@ -0,0 +1,82 @@
+"""Module for decoding the message text stored in attributedBody typedstream blobs."""
+
+from typing import Iterable, List, Optional
+
+# Typedstream tags announcing a little-endian integer wider than one byte.
+_INT16_TAG = 0x81
+_INT32_TAG = 0x82
+
+# The string object header following the NSString or NSMutableString class
+# name ends with the '+' type code, normally 4 bytes after the name.
+_TYPE_CODE = ord("+")
+_TYPE_CODE_OFFSET = 4
+_TYPE_CODE_WINDOW = 16
+
+
+def decode_attributed_body(attributed_body: Optional[bytes]) -> str:
+    """Extract the plain text of a message from its attributedBody blob.
+
+    The blob is walked by offset; the only copy made is the slice holding
+    the text itself, which is decoded straight into the returned string.
+
+    Args:
+        attributed_body: The attributedBody column of a message row.
+
+    Returns:
+        The message text, or an empty string if the blob is empty or malformed.
+    """
+    if not attributed_body:
+        return ""
+
+    index = attributed_body.find(b"NSString")
+    if index != -1:
+        class_end = index + 8
+    else:
+        index = attributed_body.find(b"NSMutableString")
+        if index == -1:
+            return ""
+        class_end = index + 15
+
+    position = class_end + _TYPE_CODE_OFFSET
+    if position >= len(attributed_body) or attributed_body[position] != _TYPE_CODE:
+        position = attributed_body.find(b"+", class_end, class_end + _TYPE_CODE_WINDOW)
+        if position == -1:
+            return ""
+    position += 1
+    if position >= len(attributed_body):
+        return ""
+
+    tag = attributed_body[position]
+    if tag < 0x80:
+        length = tag
+        start = position + 1
+    elif tag == _INT16_TAG:
+        start = position + 3
+        length = int.from_bytes(attributed_body[position + 1:start], "little")
+    elif tag == _INT32_TAG:
+        start = position + 5
+        length = int.from_bytes(attributed_body[position + 1:start], "little")
+    else:
+        return ""
+
+    end = start + length
+    if end > len(attributed_body):
+        return ""
+    return attributed_body[start:end].decode("utf-8", "replace")
+
+
+def decode_attributed_bodies(attributed_bodies: Iterable[Optional[bytes]]) -> List[str]:
+    """Decode a batch of attributedBody blobs.
+
+    A convenience wrapper around decode_attributed_body, which does the
+    same work per blob. Its only saving is skipping the call for the rows
+    without a blob, most of them when the caller already has the plain text.
+
+    Args:
+        attributed_bodies: The attributedBody columns of many message rows.
+
+    Returns:
+        The message texts in the same order, empty strings for unusable blobs.
+    """
+    decode = decode_attributed_body
+    return [decode(attributed_body) if attributed_body else "" for attributed_body in attributed_bodies]
@@ -1,11 +1,14 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List
 from ..contacts_collection.contact import Contact
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Chat:
     """Represents a chat conversation.
 
+    Chats are immutable, which lets chat_name be computed once when the chat
+    is created instead of on every access.
+
     Attributes:
         chat_id: An integer representing the unique identifier of the chat.
         display_name: A string representing the display name of the chat.
@@ -18,9 +21,12 @@ class Chat:
     display_name: str
     chat_identifier: str
     members: List[Contact]
+    chat_name: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "chat_name", self._definitive_name())
 
-    @property
-    def chat_name(self) -> str:
+    def _definitive_name(self) -> str:
         """Returns the definitive name of the chat."""
 
         if not self.display_name.startswith("chat"):
@@ -0,0 +1,76 @@
+"""Module for caching the last activity of every chat in a sidecar database."""
+
+import sqlite3
+from typing import Dict
+
+
+class ChatActivityIndex:
+    """A sidecar SQLite database holding the latest message date of every chat.
+
+    The index is filled from chat_message_join and afterwards only reads rows
+    whose message_id is above the highest one already seen, so refreshing it
+    costs time proportional to the new messages. chat.db itself is never
+    written to.
+    """
+
+    def __init__(self, index_path: str):
+        """Initialize the ChatActivityIndex and create its table if needed."""
+        self.index_path = index_path
+        self.conn = sqlite3.connect(index_path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS chat_activity (
+                    chat_id INTEGER PRIMARY KEY,
+                    last_message_date INTEGER NOT NULL,
+                    last_message_id INTEGER NOT NULL
+                )
+            """)
+
+    def refresh(self, chat_db: sqlite3.Connection) -> None:
+        """Fold messages added to chat.db since the last refresh into the index.
+
+        If chat.db no longer reaches the highest message_id indexed, it was
+        replaced or restored, and the index is rebuilt from scratch.
+        """
+        high_water = self.conn.execute(
+            "SELECT COALESCE(MAX(last_message_id), 0) FROM chat_activity"
+        ).fetchone()[0]
+
+        cursor = chat_db.cursor()
+        max_message_id = cursor.execute(
+            "SELECT COALESCE(MAX(message_id), 0) FROM chat_message_join"
+        ).fetchone()[0]
+        if max_message_id < high_water:
+            # The database was replaced or restored; the cached rows are meaningless.
+            with self.conn:
+                self.conn.execute("DELETE FROM chat_activity")
+            high_water = 0
+
+        # The unary + keeps SQLite from scanning the whole (chat_id, ...) index
+        # to satisfy the GROUP BY instead of seeking on message_id.
+        cursor.execute("""
+            SELECT chat_id, MAX(message_date), MAX(message_id)
+            FROM chat_message_join
+            WHERE message_id > ?
+            GROUP BY +chat_id
+        """, (high_water,))
+        rows = cursor.fetchall()
+
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO chat_activity (chat_id, last_message_date, last_message_id)
+                VALUES (?, ?, ?)
+                ON CONFLICT(chat_id) DO UPDATE SET
+                    last_message_date = MAX(last_message_date, excluded.last_message_date),
+                    last_message_id = MAX(last_message_id, excluded.last_message_id)
+            """, rows)
+
+    def last_activity(self) -> Dict[int, int]:
+        """Return the latest message date of every indexed chat, keyed by chat ID."""
+        return dict(self.conn.execute(
+            "SELECT chat_id, last_message_date FROM chat_activity"
+        ))
+
+    def close(self) -> None:
+        """Close the index database."""
+        self.conn.close()
@@ -0,0 +1,72 @@
+"""Module for persisting the enriched chat list between sessions."""
+
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+from .chat import Chat
+from ..contacts_collection.contact import Contact
+
+
+class ChatListCache:
+    """A JSON file holding the enriched chat list and the database fingerprint it was built from.
+
+    The fingerprint combines the size and mtime of chat.db and its WAL with
+    the highest message ROWID, so a cached list can be shown immediately and
+    only rebuilt when the database has actually changed.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the ChatListCache."""
+        self.path = path
+
+    @staticmethod
+    def fingerprint(db_path: str, max_rowid: int) -> Dict[str, int]:
+        """Build the fingerprint of a database from its files and highest message ROWID."""
+        fingerprint = {"max_rowid": max_rowid}
+        for suffix in ("", "-wal"):
+            try:
+                stat = os.stat(f"{db_path}{suffix}")
+            except OSError:
+                continue
+            fingerprint[f"size{suffix}"] = stat.st_size
+            fingerprint[f"mtime{suffix}"] = stat.st_mtime_ns
+        return fingerprint
+
+    def load(self) -> Optional[Tuple[Dict[str, int], List[Chat]]]:
+        """Load the cached fingerprint and chats, or None if there is no usable cache."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            chats = [
+                Chat(
+                    chat_id=chat["chat_id"],
+                    display_name=chat["display_name"],
+                    chat_identifier=chat["chat_identifier"],
+                    members=[Contact(phone_number=phone, name=name) for phone, name in chat["members"]]
+                )
+                for chat in data["chats"]
+            ]
+            return data["fingerprint"], chats
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, fingerprint: Dict[str, int], chats: List[Chat]) -> None:
+        """Write the fingerprint and chats to disk atomically."""
+        data = {
+            "fingerprint": fingerprint,
+            "chats": [
+                {
+                    "chat_id": chat.chat_id,
+                    "display_name": chat.display_name,
+                    "chat_identifier": chat.chat_identifier,
+                    "members": [[member.phone_number, member.name] for member in chat.members],
+                }
+                for chat in chats
+            ],
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
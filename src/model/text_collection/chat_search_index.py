@@ -0,0 +1,114 @@
+"""Module containing ChatSearchIndex, an incremental search over the chat list."""
+
+import re
+import threading
+from array import array
+from typing import Dict, Iterable, List
+from .chat import Chat
+
+_PHONE_QUERY = re.compile(r"[\d\s()+\-.]*\d[\d\s()+\-.]*")
+_NON_DIGITS = re.compile(r"\D")
+
+
+class ChatSearchIndex:
+    """Finds chats by name, member name or phone number.
+
+    Every chat gets one lowercase search key made of its name, its members'
+    names and their phone numbers (also as bare digits), and a trigram
+    index maps every three characters to the chats whose key contains
+    them. A query is checked only against the chats of its rarest trigram,
+    and a query that extends the previous one only against the previous
+    results, so each keystroke narrows the last result set.
+
+    Results are ranked by match quality (exact name, name prefix, word
+    prefix in the name, anywhere in the name, then members and phone
+    numbers) and, within a rank, by recency, the order chats were given in.
+    """
+
+    def __init__(self):
+        """Initialize an empty ChatSearchIndex."""
+        self._chats: List[Chat] = []
+        self._names: List[str] = []
+        self._keys: List[str] = []
+        self._trigrams: Dict[str, array] = {}
+        self._last_query = ""
+        self._last_positions: List[int] = []
+        self._lock = threading.Lock()
+
+    def build(self, chats: Iterable[Chat]) -> None:
+        """Index chats, given most recently active first.
+
+        The index is built aside and swapped in, so searches on another
+        thread keep using the previous one meanwhile.
+        """
+        chats = list(chats)
+        # Contacts without a first or last name, e.g. companies, have no name
+        names = [(chat.chat_name or "").lower() for chat in chats]
+        keys = []
+        trigrams: Dict[str, array] = {}
+        for position, chat in enumerate(chats):
+            parts = [chat.chat_name]
+            for member in chat.members:
+                phone_number = member.phone_number or ""
+                parts.extend((member.name, phone_number, _NON_DIGITS.sub("", phone_number)))
+            key = "\n".join(part for part in parts if part).lower()
+            keys.append(key)
+            for trigram in {key[i:i + 3] for i in range(len(key) - 2)}:
+                postings = trigrams.get(trigram)
+                if postings is None:
+                    postings = trigrams[trigram] = array('i')
+                postings.append(position)
+
+        with self._lock:
+            self._chats, self._names, self._keys, self._trigrams = chats, names, keys, trigrams
+            self._last_query = ""
+            self._last_positions = []
+
+    def search(self, query: str) -> List[Chat]:
+        """Return the chats matching query, best and most recent first."""
+        with self._lock:
+            return self._search(query.strip().lower())
+
+    def _search(self, query: str) -> List[Chat]:
+        """Search for an already normalized query."""
+        if not query:
+            return list(self._chats)
+        # Phone numbers are matched on their digits whatever the formatting typed
+        term = _NON_DIGITS.sub("", query) if _PHONE_QUERY.fullmatch(query) else query
+
+        if self._last_query and term.startswith(self._last_query):
+            candidates: Iterable[int] = self._last_positions
+        elif len(term) >= 3:
+            candidates = self._rarest_trigram_postings(term)
+        else:
+            candidates = range(len(self._keys))
+        keys = self._keys
+        positions = [position for position in candidates if term in keys[position]]
+        self._last_query, self._last_positions = term, positions
+        return self._rank(query, positions)
+
+    def _rarest_trigram_postings(self, term: str) -> Iterable[int]:
+        """Return the chats containing the least common trigram of term."""
+        postings = [self._trigrams.get(term[i:i + 3]) for i in range(len(term) - 2)]
+        if any(posting is None for posting in postings):
+            return ()
+        return min(postings, key=len)
+
+    def _rank(self, query: str, positions: List[int]) -> List[Chat]:
+        """Order matching chats by match quality, keeping recency order within each quality."""
+        buckets: List[List[Chat]] = [[], [], [], [], []]
+        word_start = " " + query
+        for position in positions:
+            name = self._names[position]
+            if name == query:
+                rank = 0
+            elif name.startswith(query):
+                rank = 1
+            elif word_start in name:
+                rank = 2
+            elif query in name:
+                rank = 3
+            else:
+                rank = 4
+            buckets[rank].append(self._chats[position])
+        return [chat for bucket in buckets for chat in bucket]
@@ -0,0 +1,139 @@
+"""Module providing per-thread read-only connections to the Messages database."""
+
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class ReadConnectionPool:
+    """A pool of read-only SQLite connections, one per thread.
+
+    Every thread that asks for a connection gets its own, opened through a
+    mode=ro URI so the live Messages database is never locked for writing.
+    Connections of threads that have finished are closed the next time a
+    new one is opened.
+
+    Attributes:
+        db_path: Path to the SQLite database file.
+        immutable: Whether to open the database with immutable=1, which skips
+            all locking. Only safe when nothing else is writing to the file.
+        mmap_size: Value for PRAGMA mmap_size, in bytes.
+        cache_size: Value for PRAGMA cache_size, negative values are KiB.
+        temp_store: Value for PRAGMA temp_store.
+    """
+
+    def __init__(self, db_path: str, immutable: bool = False, mmap_size: int = 256 * 1024 * 1024,
+                 cache_size: int = -64 * 1024, temp_store: str = "MEMORY"):
+        """Initialize the ReadConnectionPool."""
+        self.db_path = db_path
+        self.immutable = immutable
+        self.mmap_size = mmap_size
+        self.cache_size = cache_size
+        self.temp_store = temp_store
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def uri(self) -> str:
+        """Returns the read-only URI used to open the database."""
+        uri = Path(self.db_path).expanduser().resolve().as_uri() + "?mode=ro"
+        if self.immutable:
+            uri += "&immutable=1"
+        return uri
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it if needed."""
+        thread_id = threading.get_ident()
+        conn = self._connections.get(thread_id)
+        if conn is None:
+            conn = self._open()
+            with self._lock:
+                self._close_finished_threads()
+                self._connections[thread_id] = conn
+        return conn
+
+    def _open(self) -> sqlite3.Connection:
+        """Open a read-only connection and apply the read profile pragmas."""
+        # Connections are only used by the thread that opened them; the check
+        # is disabled so close_all can run from any thread.
+        conn = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = {int(self.cache_size)}")
+        conn.execute(f"PRAGMA temp_store = {self.temp_store}")
+        conn.execute("PRAGMA query_only = 1")
+        return conn
+
+    def _close_finished_threads(self) -> None:
+        """Close the connections of threads that are no longer running."""
+        alive = {thread.ident for thread in threading.enumerate()}
+        for thread_id in [t for t in self._connections if t not in alive]:
+            self._connections.pop(thread_id).close()
+
+    def close_all(self) -> None:
+        """Close every connection in the pool."""
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+
+
+class SnapshotConnectionPool(ReadConnectionPool):
+    """A ReadConnectionPool that reads from a point-in-time copy of the database.
+
+    When the pool is created the database, including anything still in its
+    WAL, is copied with the SQLite backup API into either a shared in-memory
+    database or a local temporary file. All connections then read that copy,
+    so a long export sees one consistent view and never contends with
+    Messages.app for locks.
+    """
+
+    def __init__(self, db_path: str, in_memory: bool = True, **kwargs):
+        """Initialize the SnapshotConnectionPool and take the snapshot.
+
+        Args:
+            db_path: Path to the SQLite database file to snapshot.
+            in_memory: Copy into RAM if True, otherwise into a temporary file.
+            **kwargs: Read profile options passed to ReadConnectionPool.
+        """
+        super().__init__(db_path, **kwargs)
+        self.in_memory = in_memory
+        self.snapshot_path: Optional[str] = None
+        # Keeps an in-memory snapshot alive; a shared in-memory database is
+        # dropped as soon as its last connection closes.
+        self._holder: Optional[sqlite3.Connection] = None
+        self._take_snapshot()
+
+    @property
+    def uri(self) -> str:
+        """Returns the URI of the snapshot."""
+        if self.in_memory:
+            return f"file:hermes-snapshot-{id(self)}?mode=memory&cache=shared"
+        return Path(self.snapshot_path).as_uri() + "?mode=ro&immutable=1"
+
+    def _take_snapshot(self) -> None:
+        """Copy the live database into the snapshot."""
+        source = sqlite3.connect(super().uri, uri=True)
+        try:
+            if self.in_memory:
+                self._holder = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+                source.backup(self._holder)
+            else:
+                fd, self.snapshot_path = tempfile.mkstemp(prefix="hermes-snapshot-", suffix=".db")
+                os.close(fd)
+                with closing(sqlite3.connect(self.snapshot_path)) as target:
+                    source.backup(target)
+        finally:
+            source.close()
+
+    def close_all(self) -> None:
+        """Close every connection and discard the snapshot."""
+        super().close_all()
+        if self._holder:
+            self._holder.close()
+            self._holder = None
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            os.remove(self.snapshot_path)
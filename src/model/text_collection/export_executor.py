@@ -0,0 +1,70 @@
+"""Module for running chat exports in parallel, each in its own workspace."""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+class ExportExecutor:
+    """Runs export jobs on a pool of workers.
+
+    Every job gets a private temporary workspace created next to its
+    destination, so jobs never see each other's files. When a job succeeds
+    the file it produced is moved onto the destination with os.replace, an
+    atomic rename on the same file system. The workspace is always removed
+    afterwards, so a failed job leaves no partial output behind.
+
+    Jobs mostly wait on imessage-exporter subprocesses and file I/O, so
+    threads are enough to keep every core busy.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """Initialize the ExportExecutor.
+
+        Args:
+            max_workers: The number of jobs run at once, the number of CPUs by default.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hermes-export")
+
+    def submit(self, destination: str, job: Callable[[str], Optional[str]]) -> "Future[str]":
+        """Schedule an export job.
+
+        Args:
+            destination: The final path of the exported file.
+            job: Called with the path of the job's workspace; returns the path
+                of the file it produced there, or None if nothing was exported.
+
+        Returns:
+            A future resolving to destination once the file is in place. It
+            raises the job's exception, or FileNotFoundError if the job
+            produced no file.
+        """
+        return self._executor.submit(self.run, destination, job)
+
+    @staticmethod
+    def run(destination: str, job: Callable[[str], Optional[str]]) -> str:
+        """Run a job in the calling thread in a fresh workspace and move its result onto destination."""
+        parent = os.path.dirname(os.path.abspath(destination))
+        os.makedirs(parent, exist_ok=True)
+        workspace = tempfile.mkdtemp(prefix=".hermes-export-", dir=parent)
+        try:
+            produced = job(workspace)
+            if not produced or not os.path.exists(produced):
+                raise FileNotFoundError(f"Export produced no file for {destination}")
+            os.replace(produced, destination)
+            return destination
+        finally:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs, optionally waiting for the running ones."""
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> 'ExportExecutor':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
@@ -0,0 +1,239 @@
+"""Module for streaming message exports to TXT, JSONL or CSV files."""
+
+import csv
+import gzip
+import io
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterable, List, Type
+from .message import Message
+from .message_batch import MessageBatch
+from .timestamps import format_datetimes
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+CSV_FIELDS = ["row_id", "date", "sender", "handle", "is_from_me", "has_attachments", "body"]
+
+
+@dataclass
+class ExportStats:
+    """Throughput of an export.
+
+    Attributes:
+        messages: The number of messages written.
+        bytes: The number of bytes written before compression.
+        seconds: The time spent formatting and writing.
+    """
+
+    messages: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def messages_per_second(self) -> float:
+        """Returns the number of messages written per second."""
+        return self.messages / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Returns the number of bytes written per second."""
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+    def add(self, other: 'ExportStats') -> None:
+        """Accumulate the counts of another export."""
+        self.messages += other.messages
+        self.bytes += other.bytes
+        self.seconds += other.seconds
+
+    def __str__(self) -> str:
+        return (f"{self.messages} messages, {self.bytes / 1e6:.1f} MB in {self.seconds:.2f} s "
+                f"({self.messages_per_second:,.0f} messages/s, {self.bytes_per_second / 1e6:.1f} MB/s)")
+
+
+class ExportWriter:
+    """Base class of the streaming export writers.
+
+    Messages are formatted a batch at a time, joined and encoded once, and
+    handed to a large write buffer, optionally through gzip. Subclasses
+    implement _format_batch and _format_messages for their format.
+    """
+
+    extension = ""
+
+    def __init__(self, path: str, compress: bool = False, append: bool = False,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """Open the output file.
+
+        Args:
+            path: The path of the file to write.
+            compress: Whether to gzip the output.
+            append: Whether to add to an existing file instead of replacing it.
+                No header is written when appending; gzip appends a new member.
+            buffer_size: The size of the write buffer in bytes.
+        """
+        self.path = path
+        self.stats = ExportStats()
+        mode = "ab" if append else "wb"
+        if not append and os.path.lexists(path):
+            # Start a new file so copies hardlinked from this one keep their content
+            os.unlink(path)
+        if compress:
+            self._file: BinaryIO = io.BufferedWriter(gzip.open(path, mode, compresslevel=6), buffer_size)
+        else:
+            self._file = open(path, mode, buffering=buffer_size)
+        if not append:
+            self._write(self._header())
+
+    @classmethod
+    def file_name(cls, name: str, compress: bool = False) -> str:
+        """Return the file name of an export called name in this format."""
+        return f"{name}.{cls.extension}" + (".gz" if compress else "")
+
+    def write_batch(self, batch: MessageBatch) -> None:
+        """Write every message of a MessageBatch straight from its columns."""
+        started = time.perf_counter()
+        self._write(self._format_batch(batch), len(batch))
+        self.stats.seconds += time.perf_counter() - started
+
+    def write_messages(self, messages: Iterable[Message], chunk_size: int = 1000) -> None:
+        """Write Message objects from an iterator, a chunk at a time."""
+        started = time.perf_counter()
+        chunk: List[Message] = []
+        for message in messages:
+            chunk.append(message)
+            if len(chunk) >= chunk_size:
+                self._write(self._format_messages(chunk), len(chunk))
+                chunk = []
+        if chunk:
+            self._write(self._format_messages(chunk), len(chunk))
+        self.stats.seconds += time.perf_counter() - started
+
+    def close(self) -> ExportStats:
+        """Flush and close the file and return the throughput of the writer."""
+        started = time.perf_counter()
+        self._file.close()
+        self.stats.seconds += time.perf_counter() - started
+        return self.stats
+
+    def __enter__(self) -> 'ExportWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _write(self, text: str, messages: int = 0) -> None:
+        """Encode text and hand it to the write buffer in one call."""
+        data = text.encode("utf-8")
+        self._file.write(data)
+        self.stats.bytes += len(data)
+        self.stats.messages += messages
+
+    def _header(self) -> str:
+        """Return the text written at the start of a new file."""
+        return ""
+
+    def _format_batch(self, batch: MessageBatch) -> str:
+        raise NotImplementedError
+
+    def _format_messages(self, messages: List[Message]) -> str:
+        raise NotImplementedError
+
+
+class TextExportWriter(ExportWriter):
+    """Writes "date - sender: body" lines, the format of the text exports."""
+
+    extension = "txt"
+
+    def _format_batch(self, batch: MessageBatch) -> str:
+        return "".join(batch.export_lines())
+
+    def _format_messages(self, messages: List[Message]) -> str:
+        dates = format_datetimes(message.date for message in messages)
+        return "".join(f"{date} - {message.sender.name}: {message.body}\n"
+                       for date, message in zip(dates, messages))
+
+
+class JsonLinesExportWriter(ExportWriter):
+    """Writes one JSON object per message with the keys of CSV_FIELDS."""
+
+    extension = "jsonl"
+
+    def _format_batch(self, batch: MessageBatch) -> str:
+        return self._to_json_lines(_batch_rows(batch))
+
+    def _format_messages(self, messages: List[Message]) -> str:
+        return self._to_json_lines(_message_rows(messages))
+
+    @staticmethod
+    def _to_json_lines(rows: Iterable[tuple]) -> str:
+        # Only the string fields need escaping, so the objects are filled into
+        # a template instead of going through json.dumps one dict at a time.
+        encode = json.JSONEncoder(ensure_ascii=False).encode
+        return "".join(
+            f'{{"row_id": {row_id}, "date": "{date}", "sender": {encode(sender)}, "handle": {encode(handle)}, '
+            f'"is_from_me": {"true" if is_from_me else "false"}, '
+            f'"has_attachments": {"true" if has_attachments else "false"}, "body": {encode(body)}}}\n'
+            for row_id, date, sender, handle, is_from_me, has_attachments, body in rows
+        )
+
+
+class CsvExportWriter(ExportWriter):
+    """Writes one CSV record per message below a header of CSV_FIELDS."""
+
+    extension = "csv"
+
+    def _header(self) -> str:
+        return self._to_csv([CSV_FIELDS])
+
+    def _format_batch(self, batch: MessageBatch) -> str:
+        return self._to_csv(_batch_rows(batch))
+
+    def _format_messages(self, messages: List[Message]) -> str:
+        return self._to_csv(_message_rows(messages))
+
+    @staticmethod
+    def _to_csv(rows: Iterable[Iterable]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
+
+EXPORT_WRITERS: Dict[str, Type[ExportWriter]] = {
+    "txt": TextExportWriter,
+    "jsonl": JsonLinesExportWriter,
+    "csv": CsvExportWriter,
+}
+
+
+def create_export_writer(export_format: str, path: str, compress: bool = False,
+                         append: bool = False) -> ExportWriter:
+    """Return the writer of export_format ("txt", "jsonl" or "csv") for path."""
+    try:
+        writer_class = EXPORT_WRITERS[export_format]
+    except KeyError:
+        raise ValueError(f"Unsupported export format: {export_format}") from None
+    return writer_class(path, compress=compress, append=append)
+
+
+def _batch_rows(batch: MessageBatch) -> Iterable[tuple]:
+    """Return the CSV_FIELDS of every message of a batch."""
+    senders = batch.senders
+    return (
+        (row_id, date, senders[sender_index].name, senders[sender_index].phone_number,
+         bool(is_from_me), bool(has_attachments), body)
+        for row_id, date, sender_index, is_from_me, has_attachments, body in zip(
+            batch.row_ids, batch.formatted_dates(), batch.sender_indexes,
+            batch.is_from_me, batch.has_attachments, batch.bodies)
+    )
+
+
+def _message_rows(messages: List[Message]) -> Iterable[tuple]:
+    """Return the CSV_FIELDS of every message of a list."""
+    dates = format_datetimes(message.date for message in messages)
+    return (
+        (message.row_id, date, message.sender.name, message.sender.phone_number,
+         message.is_from_me, message.has_attachments, message.body)
+        for date, message in zip(dates, messages)
+    )
@@ -1,10 +1,12 @@
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime, tzinfo
+from typing import Dict, List, Optional
 from ..contacts_collection.contact import Contact
+from .attributed_body import decode_attributed_body
+from .timestamps import to_datetimes
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """Represents an individual text message.
 
@@ -41,31 +43,56 @@ class Message:
         return self.has_attachments and not self.body
 
     @classmethod
-    def from_database_result(cls, result: tuple, self_contact: Contact) -> 'Message':
+    def from_database_result(cls, result: tuple, self_contact: Contact,
+                             timezone: Optional[tzinfo] = None,
+                             senders: Optional[Dict[int, Contact]] = None) -> 'Message':
         """
         Create a Message instance from a database query result.
 
         Args:
             result: A tuple containing the database query result.
             self_contact: The Contact object representing the user.
+            timezone: The timezone to express the message date in, None for UTC.
+            senders: Optional shared Contact of every handle, keyed by handle ROWID.
 
         Returns:
             A Message instance.
         """
-        (row_id, guid, date, text, attributed_body, handle_id, is_from_me,
-         cache_has_attachments, associated_message_guid, associated_message_type) = result
-
         # Convert the Apple epoch timestamp to a datetime object
-        message_date = cls.format_time(date)
+        return cls._from_row(result, self_contact, to_datetimes([result[2]], timezone)[0], senders)
+
+    @classmethod
+    def from_database_results(cls, results: List[tuple], self_contact: Contact,
+                              timezone: Optional[tzinfo] = None,
+                              senders: Optional[Dict[int, Contact]] = None) -> List['Message']:
+        """
+        Create Message instances from a batch of database query results.
+
+        The dates of the whole batch are converted in one vectorized step.
+
+        Args:
+            results: A list of tuples containing database query results.
+            self_contact: The Contact object representing the user.
+            timezone: The timezone to express message dates in, None for UTC.
+            senders: Optional shared Contact of every handle, keyed by handle ROWID.
+
+        Returns:
+            A list of Message instances in the same order.
+        """
+        dates = to_datetimes([result[2] for result in results], timezone)
+        return [cls._from_row(result, self_contact, date, senders) for result, date in zip(results, dates)]
+
+    @classmethod
+    def _from_row(cls, result: tuple, self_contact: Contact, message_date: Optional[datetime],
+                  senders: Optional[Dict[int, Contact]]) -> 'Message':
+        """Create a Message instance from a database row and its converted date."""
+        (row_id, guid, date, text, attributed_body, handle_id, is_from_me,
+         cache_has_attachments, associated_message_guid, associated_message_type, handle) = result
 
-        # Extract the message body or set placeholder for image
-        if cache_has_attachments and not text:
-            body = "(Image Attachment)"
-        else:
-            body = text if text else cls._extract_attributed_body(attributed_body)
+        body = cls._extract_body(text, attributed_body, cache_has_attachments)
 
         # Determine the sender
-        sender = self_contact if is_from_me else Contact(phone_number=handle_id, name=handle_id)
+        sender = self_contact if is_from_me else cls.resolve_sender(handle_id, handle, senders)
 
         return cls(
             row_id=row_id,
@@ -80,36 +107,29 @@ class Message:
         )
 
     @staticmethod
-    def format_time(timestamp: int) -> Optional[datetime]:
-        """Format a timestamp into a datetime object.
+    def resolve_sender(handle_id: int, handle: Optional[str], senders: Optional[Dict[int, Contact]]) -> Contact:
+        """Return the shared Contact for a handle ROWID.
 
-        Args:
-            timestamp: The timestamp to format.
-
-        Returns:
-            A datetime object or None if timestamp is None.
+        Handles missing from senders, for example ones created after the map
+        was built, get a Contact named after their id, which is then added to
+        senders so later messages share it.
         """
-        if timestamp is None:
-            return None
-        apple_epoch = datetime(2001, 1, 1)
-        time_sent_seconds = timestamp / 1_000_000_000
-        return apple_epoch + timedelta(seconds=time_sent_seconds)
+        sender = senders.get(handle_id) if senders is not None else None
+        if sender is None:
+            name = handle if handle else handle_id
+            sender = Contact(phone_number=name, name=name)
+            if senders is not None:
+                senders[handle_id] = sender
+        return sender
+
+    @classmethod
+    def _extract_body(cls, text: Optional[str], attributed_body: Optional[bytes], has_attachments: bool) -> str:
+        """Extract the message body or set placeholder for image."""
+        if has_attachments and not text:
+            return "(Image Attachment)"
+        return text if text else cls._extract_attributed_body(attributed_body)
 
     @staticmethod
     def _extract_attributed_body(attributed_body: bytes) -> str:
         """Extract the message body from attributed body."""
-        if not attributed_body:
-            return ""
-
-        try:
-            decoded_body = attributed_body.split(b"NSString")[1]
-            text = decoded_body[5:]
-            if text[0] == 129:
-                length = int.from_bytes(text[1:3], "little")
-                text = text[3:length+3]
-            else:
-                length = text[0]
-                text = text[1:length+1]
-            return text.decode()
-        except (IndexError, UnicodeDecodeError):
-            return ""
+        return decode_attributed_body(attributed_body)
@@ -0,0 +1,158 @@
+"""Module containing the MessageBatch class, a columnar store for many messages."""
+
+from array import array
+from collections import Counter
+from datetime import datetime, tzinfo
+from typing import Dict, Iterator, List, Optional
+from .message import Message
+from .timestamps import MISSING_TIMESTAMP, format_timestamps, to_datetimes
+from ..contacts_collection.contact import Contact
+
+# Number of rows whose dates are converted together while iterating.
+_CHUNK_SIZE = 1000
+# Stands for a NULL associated_message_type, which the integer column cannot hold
+_MISSING_TYPE = -2 ** 63
+
+
+class MessageBatch:
+    """Stores the messages of a conversation as parallel columns.
+
+    Numeric fields live in compact arrays and each sender is stored once in
+    a table referenced by index, so a large conversation costs a few bytes
+    per message plus its strings instead of a Message, Contact and datetime
+    per row. Message objects are only built when an item is accessed.
+
+    Attributes:
+        row_ids: The ROWID of every message.
+        dates: The Apple epoch timestamp of every message in nanoseconds,
+            MISSING_TIMESTAMP where the database has none.
+        is_from_me: 1 for messages sent by the user, 0 otherwise.
+        has_attachments: 1 for messages with attachments, 0 otherwise.
+        sender_indexes: The index of every message's sender in senders.
+        senders: The distinct senders; index 0 is the user.
+        guids: The GUID of every message.
+        bodies: The body of every message.
+        associated_message_guids: The associated message GUID of every message.
+        associated_message_types: The associated message type of every message,
+            _MISSING_TYPE where the database has none.
+        timezone: The timezone message dates are expressed in, None for UTC.
+    """
+
+    def __init__(self, self_contact: Contact, timezone: Optional[tzinfo] = None,
+                 handle_contacts: Optional[Dict[int, Contact]] = None):
+        """Initialize an empty MessageBatch.
+
+        Args:
+            self_contact: The Contact object representing the user.
+            timezone: The timezone to express message dates in, None for UTC.
+            handle_contacts: Optional shared Contact of every handle, keyed by handle ROWID.
+        """
+        self.row_ids = array('q')
+        self.dates = array('q')
+        self.is_from_me = array('b')
+        self.has_attachments = array('b')
+        self.sender_indexes = array('i')
+        self.senders: List[Contact] = [self_contact]
+        self.guids: List[str] = []
+        self.bodies: List[str] = []
+        self.associated_message_guids: List[Optional[str]] = []
+        self.associated_message_types = array('q')
+        self.timezone = timezone
+        self._handle_contacts = handle_contacts
+        self._handle_indexes: Dict[int, int] = {}
+
+    @classmethod
+    def from_database_results(cls, results: List[tuple], self_contact: Contact,
+                              timezone: Optional[tzinfo] = None,
+                              handle_contacts: Optional[Dict[int, Contact]] = None) -> 'MessageBatch':
+        """Create a MessageBatch from database query results.
+
+        Args:
+            results: Tuples in the column order expected by Message.from_database_result.
+            self_contact: The Contact object representing the user.
+            timezone: The timezone to express message dates in, None for UTC.
+            handle_contacts: Optional shared Contact of every handle, keyed by handle ROWID.
+
+        Returns:
+            A MessageBatch holding the results in order.
+        """
+        batch = cls(self_contact, timezone, handle_contacts)
+        batch.extend(results)
+        return batch
+
+    def extend(self, results: List[tuple]) -> None:
+        """Append database query results to the columns."""
+        for (row_id, guid, date, text, attributed_body, handle_id, is_from_me,
+             cache_has_attachments, associated_message_guid, associated_message_type, handle) in results:
+            self.row_ids.append(row_id)
+            self.dates.append(MISSING_TIMESTAMP if date is None else date)
+            self.is_from_me.append(1 if is_from_me else 0)
+            self.has_attachments.append(1 if cache_has_attachments else 0)
+            self.sender_indexes.append(0 if is_from_me else self._sender_index(handle_id, handle))
+            self.guids.append(guid)
+            self.bodies.append(Message._extract_body(text, attributed_body, cache_has_attachments))
+            self.associated_message_guids.append(associated_message_guid)
+            self.associated_message_types.append(
+                _MISSING_TYPE if associated_message_type is None else associated_message_type)
+
+    def _sender_index(self, handle_id: int, handle: Optional[str]) -> int:
+        """Return the index of a handle in senders, adding it on first sight."""
+        index = self._handle_indexes.get(handle_id)
+        if index is None:
+            index = len(self.senders)
+            self.senders.append(Message.resolve_sender(handle_id, handle, self._handle_contacts))
+            self._handle_indexes[handle_id] = index
+        return index
+
+    def __len__(self) -> int:
+        """Returns the number of messages in the batch."""
+        return len(self.row_ids)
+
+    def __getitem__(self, index: int) -> Message:
+        """Build the Message at index."""
+        return self._message(index, to_datetimes([self.dates[index]], self.timezone)[0])
+
+    def __iter__(self) -> Iterator[Message]:
+        """Build a Message for every row, converting dates a chunk at a time."""
+        for start in range(0, len(self), _CHUNK_SIZE):
+            stop = min(start + _CHUNK_SIZE, len(self))
+            dates = to_datetimes(self.dates[start:stop], self.timezone)
+            for index, date in zip(range(start, stop), dates):
+                yield self._message(index, date)
+
+    def _message(self, index: int, date: Optional[datetime]) -> Message:
+        """Build the Message at index with an already converted date."""
+        associated_message_type = self.associated_message_types[index]
+        return Message(
+            row_id=self.row_ids[index],
+            guid=self.guids[index],
+            date=date,
+            body=self.bodies[index],
+            sender=self.senders[self.sender_indexes[index]],
+            is_from_me=bool(self.is_from_me[index]),
+            has_attachments=bool(self.has_attachments[index]),
+            associated_message_guid=self.associated_message_guids[index],
+            associated_message_type=None if associated_message_type == _MISSING_TYPE else associated_message_type
+        )
+
+    def formatted_dates(self) -> List[str]:
+        """Return the date of every message formatted with DATE_FORMAT."""
+        return format_timestamps(self.dates, self.timezone)
+
+    def export_lines(self) -> List[str]:
+        """Return every message as a line of a text export."""
+        names = [sender.name for sender in self.senders]
+        return [
+            f"{date} - {names[sender_index]}: {body}\n"
+            for date, sender_index, body in zip(self.formatted_dates(), self.sender_indexes, self.bodies)
+        ]
+
+    def search(self, term: str) -> List[int]:
+        """Return the indexes of the messages whose body contains term, ignoring case."""
+        term = term.lower()
+        return [index for index, body in enumerate(self.bodies) if term in body.lower()]
+
+    def message_counts_by_sender(self) -> Dict[str, int]:
+        """Return how many messages each sender wrote, keyed by sender name."""
+        counts = Counter(self.sender_indexes)
+        return {self.senders[index].name: count for index, count in counts.items()}
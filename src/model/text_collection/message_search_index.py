@@ -0,0 +1,129 @@
+"""Module for full-text search over message bodies through an FTS5 sidecar database."""
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import List
+from .attributed_body import decode_attributed_bodies
+from ..contacts_collection.contact import Contact
+
+
+@dataclass
+class SearchHit:
+    """Represents a message matching a full-text search.
+
+    Attributes:
+        row_id: The ROWID of the message in chat.db.
+        chat_id: The ROWID of the chat the message belongs to.
+        sender: The handle (phone number or email) of the sender.
+        date: The Apple epoch timestamp of the message in nanoseconds.
+        snippet: The matching part of the body with the matches bracketed.
+        rank: The bm25 rank of the hit; lower is better.
+    """
+
+    row_id: int
+    chat_id: int
+    sender: str
+    date: int
+    snippet: str
+    rank: float
+
+
+class MessageSearchIndex:
+    """An FTS5 index over every message body, kept in a sidecar database.
+
+    Bodies come from message.text or, when that is empty, the decoded
+    attributedBody. The index is updated incrementally: only messages with
+    a ROWID above the highest one already indexed are read from chat.db.
+    """
+
+    def __init__(self, index_path: str, batch_size: int = 10000):
+        """Initialize the MessageSearchIndex and create its table if needed."""
+        self.index_path = index_path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(index_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self.conn:
+            self.conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS message_fts USING fts5(
+                    body,
+                    chat_id UNINDEXED,
+                    sender UNINDEXED,
+                    date UNINDEXED,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+            """)
+
+    def update(self, chat_db: sqlite3.Connection, self_contact: Contact) -> int:
+        """Index the messages added to chat.db since the last update.
+
+        Args:
+            chat_db: A connection to chat.db.
+            self_contact: The Contact recorded as sender of the user's own messages.
+
+        Returns:
+            The number of messages added to the index.
+        """
+        with self._lock:
+            high_water = self.conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM message_fts").fetchone()[0]
+            cursor = chat_db.cursor()
+            cursor.execute("""
+                SELECT m.ROWID, cmj.chat_id, m.is_from_me, h.id, m.date, m.text, m.attributedBody
+                FROM message AS m
+                JOIN chat_message_join AS cmj ON cmj.message_id = m.ROWID
+                LEFT JOIN handle AS h ON m.handle_id = h.ROWID
+                WHERE m.ROWID > ?
+                ORDER BY m.ROWID
+            """, (high_water,))
+
+            indexed = 0
+            while True:
+                rows = cursor.fetchmany(self.batch_size)
+                if not rows:
+                    break
+                entries = []
+                decoded = decode_attributed_bodies(row[6] if not row[5] else None for row in rows)
+                for (row_id, chat_id, is_from_me, handle, date, text, _), attributed_text in zip(rows, decoded):
+                    body = text if text else attributed_text
+                    if body:
+                        sender = self_contact.phone_number if is_from_me else handle
+                        entries.append((row_id, body, chat_id, sender, date))
+                # Commit per batch so an interrupted build resumes where it stopped.
+                with self.conn:
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO message_fts (rowid, body, chat_id, sender, date) VALUES (?, ?, ?, ?, ?)",
+                        entries
+                    )
+                indexed += len(entries)
+            return indexed
+
+    def search(self, query: str, limit: int = 50) -> List[SearchHit]:
+        """Return the messages matching every word of query, best matches first.
+
+        The last word is matched as a prefix so results keep up while typing.
+        """
+        match = self._build_match_expression(query)
+        if not match:
+            return []
+        cursor = self.conn.execute("""
+            SELECT rowid, chat_id, sender, date,
+                   snippet(message_fts, 0, '[', ']', '...', 12),
+                   rank
+            FROM message_fts
+            WHERE message_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        """, (match, limit))
+        return [SearchHit(*row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _build_match_expression(query: str) -> str:
+        """Turn free text into an FTS5 expression of quoted terms."""
+        terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+        if terms:
+            terms[-1] += "*"
+        return " ".join(terms)
+
+    def close(self) -> None:
+        """Close the index database."""
+        self.conn.close()
@@ -0,0 +1,74 @@
+"""Module containing the OpenFileCache class, a bounded set of open output files."""
+
+import os
+from collections import OrderedDict
+from typing import Any, Callable, IO, List, Optional
+
+DEFAULT_MAX_OPEN_FILES = 32
+
+
+class OpenFileCache:
+    """Keeps at most max_open output files open, closing the least recently used.
+
+    A file is truncated the first time it is opened and appended to when it
+    is reopened after being evicted, so callers can write to any number of
+    files without exhausting file descriptors.
+    """
+
+    def __init__(self, max_open: int = DEFAULT_MAX_OPEN_FILES,
+                 opener: Optional[Callable[[str, bool], Any]] = None):
+        """Initialize the OpenFileCache.
+
+        Args:
+            max_open: The maximum number of files open at once.
+            opener: Called with a path and whether to append to it; returns a
+                handle with a close method. Defaults to a UTF-8 text file.
+        """
+        self.max_open = max_open
+        self.opener = opener if opener else _open_text
+        self._files: "OrderedDict[str, Any]" = OrderedDict()
+        self._created = set()
+
+    def get(self, path: str) -> Any:
+        """Return an open handle for path, opening it if needed."""
+        handle = self._files.get(path)
+        if handle is not None:
+            self._files.move_to_end(path)
+            return handle
+
+        if len(self._files) >= self.max_open:
+            _, oldest = self._files.popitem(last=False)
+            oldest.close()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        handle = self.opener(path, path in self._created)
+        self._created.add(path)
+        self._files[path] = handle
+        return handle
+
+    def close_file(self, path: str) -> None:
+        """Close the handle of path if it is open; a later get appends to it."""
+        handle = self._files.pop(path, None)
+        if handle is not None:
+            handle.close()
+
+    @property
+    def paths(self) -> List[str]:
+        """Returns every path opened so far."""
+        return list(self._created)
+
+    def close(self) -> None:
+        """Close every open handle."""
+        while self._files:
+            _, handle = self._files.popitem()
+            handle.close()
+
+    def __enter__(self) -> 'OpenFileCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _open_text(path: str, append: bool) -> IO[str]:
+    """Open path as a UTF-8 text file, truncating it unless append is set."""
+    return open(path, "a" if append else "w", encoding="utf-8")
@@ -0,0 +1,59 @@
+"""Module for persisting how far each chat has been read from the database."""
+
+import json
+import os
+from typing import Dict, Optional
+
+
+class SyncState:
+    """The highest message ROWID seen in every chat, optionally saved as JSON.
+
+    Attributes:
+        path: Path of the JSON file the state is stored in, or None to keep
+            it in memory only.
+        high_water: The highest message ROWID seen, keyed by chat ID.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """Initialize the SyncState, loading it from disk if the file exists."""
+        self.path = path
+        self.high_water: Dict[int, int] = {}
+        self.load()
+
+    @property
+    def max_rowid(self) -> int:
+        """Returns the highest message ROWID seen in any chat."""
+        return max(self.high_water.values(), default=0)
+
+    def get(self, chat_id: int) -> int:
+        """Return the highest message ROWID seen in a chat, 0 if none."""
+        return self.high_water.get(chat_id, 0)
+
+    def update(self, chat_id: int, rowid: int) -> None:
+        """Raise the high-water mark of a chat to rowid."""
+        if rowid > self.high_water.get(chat_id, 0):
+            self.high_water[chat_id] = rowid
+
+    def clear(self) -> None:
+        """Forget every high-water mark."""
+        self.high_water.clear()
+
+    def load(self) -> None:
+        """Load the state from disk, starting empty if it is missing or unreadable."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self.high_water = {int(chat_id): rowid for chat_id, rowid in data.get("high_water", {}).items()}
+        except (OSError, ValueError):
+            self.high_water = {}
+
+    def save(self) -> None:
+        """Write the state to disk atomically."""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"high_water": self.high_water}, f)
+        os.replace(tmp_path, self.path)
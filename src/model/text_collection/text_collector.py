@@ -3,62 +3,213 @@
 import sqlite3
 import subprocess
 import os
-import shutil
+import logging
 import threading
-import queue
-from typing import List, Dict, Optional, Tuple
+from concurrent.futures import Future
+from dataclasses import replace
+from datetime import tzinfo
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, List, Dict, Iterator, Optional, Tuple
 from .chat import Chat
 from .message import Message
+from .chat_activity_index import ChatActivityIndex
+from .connection_pool import ReadConnectionPool
+from .sync_state import SyncState
+from .chat_list_cache import ChatListCache
+from .chat_search_index import ChatSearchIndex
+from .message_search_index import MessageSearchIndex, SearchHit
+from .message_batch import MessageBatch
+from .export_executor import ExportExecutor
+from .export_writer import ExportStats, ExportWriter, create_export_writer
+from .open_file_cache import OpenFileCache, DEFAULT_MAX_OPEN_FILES
 from ..contacts_collection.contact import Contact
 
+MESSAGE_COLUMNS = """
+    m.ROWID,
+    m.guid,
+    m.date,
+    m.text,
+    m.attributedBody,
+    m.handle_id,
+    m.is_from_me,
+    m.cache_has_attachments,
+    m.associated_message_guid,
+    m.associated_message_type,
+    h.id
+"""
+
+MESSAGE_QUERY = f"""
+    SELECT {MESSAGE_COLUMNS}
+    FROM chat AS c
+    JOIN chat_message_join AS cmj ON cmj.chat_id = c.ROWID
+    JOIN message AS m ON cmj.message_id = m.ROWID
+    LEFT JOIN handle AS h ON m.handle_id = h.ROWID
+    WHERE c.chat_identifier = ?
+    ORDER BY m.date, m.ROWID
+"""
+
+# Every message of the given chats, ordered along the (chat_id, message_date, message_id) index
+EXPORT_QUERY = f"""
+    SELECT cmj.chat_id, {MESSAGE_COLUMNS}
+    FROM chat_message_join AS cmj
+    JOIN message AS m ON cmj.message_id = m.ROWID
+    LEFT JOIN handle AS h ON m.handle_id = h.ROWID
+    WHERE cmj.chat_id IN ({{placeholders}})
+    ORDER BY cmj.chat_id, cmj.message_date, cmj.message_id
+"""
+
+DEFAULT_BATCH_SIZE = 1000
+EXPORT_BATCH_SIZE = 10000
+DEFAULT_PAGE_SIZE = 200
+
 class TextCollector:
     """A class for collecting and managing text messages from a SQLite database."""
 
-    def __init__(self, db_path: str):
-        """Initialize the TextCollector."""
+    def __init__(self, db_path: str, activity_index_path: Optional[str] = None,
+                 pool: Optional[ReadConnectionPool] = None, sync_state_path: Optional[str] = None,
+                 chat_list_cache_path: Optional[str] = None, search_index_path: Optional[str] = None,
+                 timezone: Optional[tzinfo] = None, export_workers: Optional[int] = None):
+        """Initialize the TextCollector.
+
+        Args:
+            db_path: Path to the Messages chat.db database.
+            activity_index_path: Optional path of a sidecar ChatActivityIndex
+                used to order the chat list instead of querying chat.db.
+            pool: Optional ReadConnectionPool with a custom read profile, or a
+                SnapshotConnectionPool to read from a consistent copy.
+            sync_state_path: Optional path of the JSON file that persists the
+                per-chat high-water marks used by sync.
+            chat_list_cache_path: Optional path of the JSON file the enriched
+                chat list is persisted to between sessions.
+            search_index_path: Optional path of the FTS5 MessageSearchIndex
+                used by search_messages.
+            timezone: The timezone message dates are expressed in, None for UTC.
+            export_workers: The number of chats exported at once by
+                export_conversations_in_parallel, the number of CPUs by default.
+        """
         self.db_path = db_path
-        self.conn: Optional[sqlite3.Connection] = None
+        self.pool = pool if pool else ReadConnectionPool(db_path)
         self.chat_cache: Dict[str, Chat] = {}
+        self.chat_search_index = ChatSearchIndex()
         self.output_file = os.path.join(os.path.dirname(__file__), 'contacts.txt')
+        self.activity_index = ChatActivityIndex(activity_index_path) if activity_index_path else None
+        self.sync_state = SyncState(sync_state_path)
+        self.chat_list_cache = ChatListCache(chat_list_cache_path) if chat_list_cache_path else None
+        self.search_index = MessageSearchIndex(search_index_path) if search_index_path else None
+        self.timezone = timezone
+        self.export_workers = export_workers
+        self._handle_contacts: Optional[Dict[int, Contact]] = None
+        self._handle_contacts_source: Optional[Dict[str, Contact]] = None
+        self._chats_by_identifier: Dict[str, Chat] = {}
+        self._chats_by_identifier_source: Optional[Dict[str, Chat]] = None
         self._connect_database()
 
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Returns the calling thread's read-only database connection."""
+        return self.pool.connection()
+
     def _connect_database(self) -> None:
-        """Establish a connection to the SQLite database."""
+        """Open the main thread's connection so a bad database path fails early."""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.pool.connection()
         except sqlite3.OperationalError:
             raise
 
-    def get_all_chat_ids_with_labels(self, contacts_cache: Dict[str, Contact]) -> List[Chat]:
-        """Retrieve all chat IDs with their corresponding labels."""
+    def get_all_chat_ids_with_labels(self, contacts_cache: Dict[str, Contact], refresh: bool = False) -> List[Chat]:
+        """Retrieve all chat IDs with their corresponding labels.
+
+        The chat list is built once and kept in chat_cache; pass refresh=True
+        to rebuild it from the database.
+        """
         try:
-            if not self.chat_cache:
+            if refresh or not self.chat_cache:
+                fingerprint = self._database_fingerprint()
                 chats = self._query_chats()
                 enriched_chats = self._enrich_chats_with_contacts(chats, contacts_cache)
                 self.chat_cache = {chat.chat_name: chat for chat in enriched_chats}
+                self.chat_search_index.build(self.chat_cache.values())
+                if self.chat_list_cache:
+                    self.chat_list_cache.save(fingerprint, enriched_chats)
             return list(self.chat_cache.values())
         except sqlite3.Error:
             raise
 
+    def load_cached_chats(self) -> Tuple[List[Chat], bool]:
+        """Populate chat_cache from the chat list persisted by a previous session.
+
+        Returns:
+            The cached chats, empty if there is no cache, and whether they were
+            built from the current state of the database.
+        """
+        if not self.chat_list_cache:
+            return [], False
+        cached = self.chat_list_cache.load()
+        if cached is None:
+            return [], False
+
+        fingerprint, chats = cached
+        self.chat_cache = {chat.chat_name: chat for chat in chats}
+        self.chat_search_index.build(self.chat_cache.values())
+        return chats, fingerprint == self._database_fingerprint()
+
+    def _database_fingerprint(self) -> Dict[str, int]:
+        """Return the fingerprint identifying the current state of the database."""
+        max_rowid = self.conn.execute("SELECT COALESCE(MAX(ROWID), 0) FROM message").fetchone()[0]
+        return ChatListCache.fingerprint(str(self.db_path), max_rowid)
+
     def _query_chats(self) -> List[Tuple[int, str, str]]:
-        """Execute the database query to fetch chats."""
+        """Execute the database query to fetch chats, most recently active first.
+
+        Last activity comes from chat_message_join.message_date, looked up per
+        chat through the (chat_id, message_date) index, so the message table
+        is never scanned.
+        """
+        if self.activity_index:
+            return self._query_chats_from_activity_index()
+
         with self.conn:
             cursor = self.conn.cursor()
             cursor.execute("""
-                SELECT cmj.chat_id,
-                       COALESCE(c.display_name, c.chat_identifier) AS display_name,
-                       c.chat_identifier
-                FROM chat_message_join AS cmj
-                JOIN message AS m ON cmj.message_id = m.ROWID
-                INNER JOIN chat AS c ON cmj.chat_id = c.ROWID
-                GROUP BY cmj.chat_id
-                ORDER BY MAX(m.date) DESC;
+                SELECT chat_id, display_name, chat_identifier
+                FROM (
+                    SELECT c.ROWID AS chat_id,
+                           COALESCE(c.display_name, c.chat_identifier) AS display_name,
+                           c.chat_identifier,
+                           (SELECT MAX(cmj.message_date)
+                            FROM chat_message_join AS cmj
+                            WHERE cmj.chat_id = c.ROWID) AS last_message_date
+                    FROM chat AS c
+                )
+                WHERE last_message_date IS NOT NULL
+                ORDER BY last_message_date DESC;
             """)
             return cursor.fetchall()
 
+    def _query_chats_from_activity_index(self) -> List[Tuple[int, str, str]]:
+        """Fetch chats ordered by the last activity cached in the sidecar index."""
+        self.activity_index.refresh(self.conn)
+        last_activity = self.activity_index.last_activity()
+
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                SELECT ROWID,
+                       COALESCE(display_name, chat_identifier) AS display_name,
+                       chat_identifier
+                FROM chat
+            """)
+            chats = [chat for chat in cursor.fetchall() if chat[0] in last_activity]
+
+        chats.sort(key=lambda chat: last_activity[chat[0]], reverse=True)
+        return chats
+
     def _enrich_chats_with_contacts(self, chats: List[Tuple[int, str, str]], contacts_cache: Dict[str, Contact]) -> List[Chat]:
         """Enrich chat data with contact information and return Chat objects."""
         enriched_chats = []
+        chat_members = self._query_all_chat_members(contacts_cache)
         for chat_id, display_name, chat_identifier in chats:
             if display_name == '' or display_name is None:
                 contact = contacts_cache.get(chat_identifier, Contact(phone_number=chat_identifier, name=chat_identifier))
@@ -67,28 +218,398 @@ class TextCollector:
                 else:
                     display_name = chat_identifier
 
-            members = self.get_chat_members(chat_id, contacts_cache)
+            members = chat_members.get(chat_id, [])
             chat = Chat(
                     chat_id=chat_id,
                     display_name=display_name,
                     chat_identifier=chat_identifier,
                     members=members
                 )
-            chat.display_name = chat.chat_name
-            enriched_chats.append(chat)
+            enriched_chats.append(replace(chat, display_name=chat.chat_name))
         return enriched_chats
 
-    def read_messages(self, chat_identifier: str, contacts_cache: Dict[str, Contact]) -> None:
-        """Read messages for a specific chat."""
+    def _query_all_chat_members(self, contacts_cache: Dict[str, Contact]) -> Dict[int, List[Contact]]:
+        """Fetch the members of every chat in a single query, keyed by chat ID."""
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT chat_id, handle_id FROM chat_handle_join")
+            rows = cursor.fetchall()
+
+        # Chats sharing a member share the handle's Contact.
+        handle_contacts = self._get_handle_contacts(contacts_cache)
+        chat_members: Dict[int, List[Contact]] = {}
+        for chat_id, handle_rowid in rows:
+            contact = handle_contacts.get(handle_rowid)
+            if contact is not None:
+                chat_members.setdefault(chat_id, []).append(contact)
+        return chat_members
+
+    def _get_handle_contacts(self, contacts_cache: Dict[str, Contact]) -> Dict[int, Contact]:
+        """Return the shared Contact of every handle, keyed by handle ROWID.
+
+        The map is built once per contacts cache from the handle table. Each
+        handle resolves to the contacts_cache entry for its id, or to a single
+        Contact named after the id, so every message and chat member from the
+        same person shares one object.
+        """
+        if self._handle_contacts is None or self._handle_contacts_source is not contacts_cache:
+            with self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute("SELECT ROWID, id FROM handle")
+                rows = cursor.fetchall()
+
+            contacts: Dict[str, Contact] = {}
+            handle_contacts: Dict[int, Contact] = {}
+            for handle_rowid, handle in rows:
+                contact = contacts.get(handle)
+                if contact is None:
+                    contact = contacts_cache.get(handle, Contact(phone_number=handle, name=handle))
+                    contacts[handle] = contact
+                handle_contacts[handle_rowid] = contact
+            self._handle_contacts = handle_contacts
+            self._handle_contacts_source = contacts_cache
+        return self._handle_contacts
+
+    def read_messages(self, chat_identifier: str, contacts_cache: Dict[str, Contact], self_contact: Contact) -> List[Message]:
+        """Read messages for a specific chat directly from the database."""
+        return list(self.iter_messages(chat_identifier, contacts_cache, self_contact))
+
+    def iter_messages(self, chat_identifier: str, contacts_cache: Dict[str, Contact], self_contact: Contact,
+                      batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Message]:
+        """Stream the messages of a chat in date order.
+
+        Rows are pulled with fetchmany, so only one batch is held in memory
+        at a time regardless of the size of the conversation.
+        """
+        senders = self._get_handle_contacts(contacts_cache)
+        for rows in self._iter_message_rows(chat_identifier, batch_size):
+            yield from Message.from_database_results(rows, self_contact, self.timezone, senders)
+
+    def iter_export_lines(self, chat_identifier: str, contacts_cache: Dict[str, Contact], self_contact: Contact,
+                          batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[str]:
+        """Stream the messages of a chat as lines of a text export.
+
+        Each fetchmany batch is loaded into a MessageBatch and written from its
+        columns, so no Message objects are built.
+        """
+        senders = self._get_handle_contacts(contacts_cache)
+        for rows in self._iter_message_rows(chat_identifier, batch_size):
+            yield from MessageBatch.from_database_results(rows, self_contact, self.timezone, senders).export_lines()
+
+    def read_message_batch(self, chat_identifier: str, contacts_cache: Dict[str, Contact], self_contact: Contact,
+                           batch_size: int = DEFAULT_BATCH_SIZE) -> MessageBatch:
+        """Read all messages of a chat into a columnar MessageBatch."""
+        batch = MessageBatch(self_contact, self.timezone, self._get_handle_contacts(contacts_cache))
+        for rows in self._iter_message_rows(chat_identifier, batch_size):
+            batch.extend(rows)
+        return batch
+
+    def _iter_message_rows(self, chat_identifier: str, batch_size: int) -> Iterator[List[tuple]]:
+        """Stream the raw message rows of a chat in date order, one fetchmany batch at a time."""
         try:
-            self._fetch_messages_from_database(chat_identifier, contacts_cache)
+            cursor = self.conn.cursor()
+            cursor.execute(MESSAGE_QUERY, (chat_identifier,))
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cursor.close()
+        except sqlite3.Error:
+            raise
+
+    def sync(self, contacts_cache: Dict[str, Contact], self_contact: Contact) -> Dict[int, List[Message]]:
+        """Fetch the messages added since the last sync, grouped by chat ID.
+
+        Only chat_message_join rows above the stored high-water ROWID are
+        read. The first sync records the current marks without returning any
+        messages. Chats with new messages move to the top of chat_cache; if a
+        chat unknown to the cache shows up, the cache is dropped so the next
+        get_all_chat_ids_with_labels call rebuilds it.
+        """
+        try:
+            cursor = self.conn.cursor()
+            max_rowid = cursor.execute("SELECT COALESCE(MAX(message_id), 0) FROM chat_message_join").fetchone()[0]
+            if max_rowid < self.sync_state.max_rowid:
+                # The database was replaced or restored; the marks are meaningless.
+                self.sync_state.clear()
+
+            if not self.sync_state.high_water:
+                cursor.execute("SELECT chat_id, MAX(message_id) FROM chat_message_join GROUP BY chat_id")
+                for chat_id, rowid in cursor.fetchall():
+                    self.sync_state.update(chat_id, rowid)
+                self.sync_state.save()
+                return {}
+
+            cursor.execute(f"""
+                SELECT cmj.chat_id, {MESSAGE_COLUMNS}
+                FROM chat_message_join AS cmj
+                JOIN message AS m ON cmj.message_id = m.ROWID
+                LEFT JOIN handle AS h ON m.handle_id = h.ROWID
+                WHERE cmj.message_id > ?
+                ORDER BY cmj.message_id
+            """, (self.sync_state.max_rowid,))
+            rows = cursor.fetchall()
         except sqlite3.Error:
             raise
 
-    def _fetch_messages_from_database(self, chat_identifier: str, contacts_cache: Dict[str, Contact]) -> None:
-        """Fetch raw message data from the database using imessage-exporter."""
+        senders = self._get_handle_contacts(contacts_cache)
+        new_rows: Dict[int, List[tuple]] = {}
+        for chat_id, *message_row in rows:
+            if message_row[0] > self.sync_state.get(chat_id):
+                new_rows.setdefault(chat_id, []).append(tuple(message_row))
+        new_messages = {
+            chat_id: Message.from_database_results(chat_rows, self_contact, self.timezone, senders)
+            for chat_id, chat_rows in new_rows.items()
+        }
+        for chat_id, messages in new_messages.items():
+            self.sync_state.update(chat_id, messages[-1].row_id)
+        self.sync_state.save()
+
+        self._move_chats_to_top(new_messages)
+        return new_messages
+
+    def _move_chats_to_top(self, new_messages: Dict[int, List[Message]]) -> None:
+        """Reorder chat_cache so chats with new messages come first, newest first."""
+        if not new_messages or not self.chat_cache:
+            return
+        chats_by_id = {chat.chat_id: name for name, chat in self.chat_cache.items()}
+        if any(chat_id not in chats_by_id for chat_id in new_messages):
+            self.chat_cache = {}
+            return
+
+        active = sorted(new_messages, key=lambda chat_id: new_messages[chat_id][-1].row_id, reverse=True)
+        names = [chats_by_id[chat_id] for chat_id in active]
+        reordered = {name: self.chat_cache[name] for name in names}
+        reordered.update((name, chat) for name, chat in self.chat_cache.items() if name not in reordered)
+        self.chat_cache = reordered
+
+    def get_message_page(self, chat_id: int, contacts_cache: Dict[str, Contact], self_contact: Contact,
+                         before_rowid: Optional[int] = None, after_rowid: Optional[int] = None,
+                         limit: int = DEFAULT_PAGE_SIZE) -> List[Message]:
+        """Get one page of a chat's messages in date order.
+
+        Pages are addressed by keyset on (message_date, message_id) of
+        chat_message_join rather than OFFSET, so the cost of a page does not
+        depend on how far back it is. With no bounds the newest page is
+        returned; before_rowid pages backwards and after_rowid forwards from
+        the given message.
+        """
+        conditions = ["cmj.chat_id = ?"]
+        params: List[object] = [chat_id]
+        for rowid, operator in ((before_rowid, "<"), (after_rowid, ">")):
+            if rowid is not None:
+                conditions.append(f"""
+                    (cmj.message_date, cmj.message_id) {operator} (
+                        SELECT message_date, message_id FROM chat_message_join
+                        WHERE chat_id = ? AND message_id = ?
+                    )""")
+                params.extend([chat_id, rowid])
+
+        # Without an after bound the page is anchored at its newest end.
+        descending = after_rowid is None
+        direction = "DESC" if descending else "ASC"
+        query = f"""
+            SELECT {MESSAGE_COLUMNS}
+            FROM chat_message_join AS cmj
+            JOIN message AS m ON cmj.message_id = m.ROWID
+            LEFT JOIN handle AS h ON m.handle_id = h.ROWID
+            WHERE {" AND ".join(conditions)}
+            ORDER BY cmj.message_date {direction}, cmj.message_id {direction}
+            LIMIT ?
+        """
+        params.append(limit)
+
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        except sqlite3.Error:
+            raise
+
+        if descending:
+            rows.reverse()
+        senders = self._get_handle_contacts(contacts_cache)
+        return Message.from_database_results(rows, self_contact, self.timezone, senders)
+
+    def export_conversation(self, chat_identifier: str, contacts_cache: Dict[str, Contact], self_contact: Contact) -> None:
+        """Write a chat to the conversations_selected folder.
+
+        Messages are read in-process; imessage-exporter is only used as a
+        fallback when the native reader fails.
+        """
+        ExportExecutor.run(
+            self._conversation_path(chat_identifier, contacts_cache),
+            lambda workspace: self._export_to_workspace(chat_identifier, contacts_cache, self_contact, workspace)
+        )
+
+    def export_conversations(self, chats: List[Chat], contacts_cache: Dict[str, Contact],
+                             self_contact: Contact) -> Dict[str, "Future[str]"]:
+        """Start writing chats to the conversations_selected folder.
+
+        The chats are exported in the background with one scan of the
+        database. Chats left unfinished because the native reader failed are
+        handed to export_conversations_in_parallel.
+
+        Returns:
+            A future per chat name resolving to the path of its export as soon
+            as that chat is written, or raising the error that stopped it.
+        """
+        futures: Dict[str, "Future[str]"] = {chat.chat_name: Future() for chat in chats}
+        thread = threading.Thread(target=self._export_conversations,
+                                  args=(chats, futures, contacts_cache, self_contact), daemon=True)
+        thread.start()
+        return futures
+
+    def _export_conversations(self, chats: List[Chat], futures: Dict[str, "Future[str]"],
+                              contacts_cache: Dict[str, Contact], self_contact: Contact) -> None:
+        """Run the single pass of export_conversations and settle every future."""
+        try:
+            self.export_chats_in_single_pass(
+                chats,
+                lambda chat: self._conversation_path(chat.chat_identifier, contacts_cache),
+                contacts_cache,
+                self_contact,
+                on_chat_exported=lambda chat, path: futures[chat.chat_name].set_result(path)
+            )
+        except sqlite3.Error:
+            remaining = [chat for chat in chats if not futures[chat.chat_name].done()]
+            try:
+                # Returns once the jobs are queued, so each chat is reported as its own job finishes
+                parallel = self.export_conversations_in_parallel(remaining, contacts_cache, self_contact)
+            except Exception as e:
+                _fail_unsettled(futures, e)
+                return
+            for chat_name, future in parallel.items():
+                future.add_done_callback(partial(_copy_future_state, futures[chat_name]))
+        except Exception as e:
+            _fail_unsettled(futures, e)
+
+    def export_conversations_in_parallel(self, chats: List[Chat], contacts_cache: Dict[str, Contact],
+                                         self_contact: Contact) -> Dict[str, "Future[str]"]:
+        """Start exporting chats on export_workers workers, each job in its own workspace.
+
+        Returns as soon as every job is submitted; the workers exit once the
+        last job has run.
+
+        Returns:
+            A future per chat name resolving to the path of its export.
+        """
+        futures = {}
+        executor = ExportExecutor(self.export_workers)
+        try:
+            for chat in chats:
+                futures[chat.chat_name] = executor.submit(
+                    self._conversation_path(chat.chat_identifier, contacts_cache),
+                    partial(self._export_to_workspace, chat.chat_identifier, contacts_cache, self_contact)
+                )
+        finally:
+            executor.shutdown(wait=False)
+        return futures
+
+    def export_chats_in_single_pass(self, chats: List[Chat], path_for: Callable[[Chat], str],
+                                    contacts_cache: Dict[str, Contact], self_contact: Contact,
+                                    export_format: str = "txt", compress: bool = False,
+                                    max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+                                    batch_size: int = EXPORT_BATCH_SIZE,
+                                    on_chat_exported: Optional[Callable[[Chat, str], None]] = None) -> ExportStats:
+        """Export many chats with one ordered scan over chat_message_join.
+
+        Rows are sorted by chat and date along the chat_message_join index, so
+        each chat's messages arrive as one contiguous run that is loaded into
+        a MessageBatch and streamed to that chat's ExportWriter. At most
+        max_open_files writers are open at once; chats that share an output
+        path are appended to it one after the other. A chat's file is closed
+        as soon as the scan moves past it.
+
+        Args:
+            chats: The chats to export.
+            path_for: Returns the output path of a chat.
+            contacts_cache: Contacts keyed by phone number or email.
+            self_contact: The Contact object representing the user.
+            export_format: "txt", "jsonl" or "csv".
+            compress: Whether to gzip the files.
+            max_open_files: The maximum number of output files open at once.
+            batch_size: The number of rows fetched from the database at a time.
+            on_chat_exported: Called with each chat and its path once the
+                chat's file is complete.
+
+        Returns:
+            The combined throughput of every writer.
+        """
+        chats_by_id = {chat.chat_id: chat for chat in chats}
+        paths = {chat_id: path_for(chat) for chat_id, chat in chats_by_id.items()}
+        stats = ExportStats()
+        if not paths:
+            return stats
+        senders = self._get_handle_contacts(contacts_cache)
+
+        def open_writer(path: str, append: bool) -> ExportWriter:
+            writer = create_export_writer(export_format, path, compress, append)
+            writers.append(writer)
+            return writer
+
+        def finish(chat_id: int) -> None:
+            finished.add(chat_id)
+            files.close_file(paths[chat_id])
+            if on_chat_exported:
+                on_chat_exported(chats_by_id[chat_id], paths[chat_id])
+
+        writers: List[ExportWriter] = []
+        finished = set()
+        current_chat_id = None
+        cursor = self.conn.cursor()
+        cursor.execute(EXPORT_QUERY.format(placeholders=", ".join("?" * len(paths))), list(paths))
+        with OpenFileCache(max_open_files, open_writer) as files:
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for chat_id, run in groupby(rows, key=itemgetter(0)):
+                        if chat_id != current_chat_id:
+                            if current_chat_id is not None:
+                                finish(current_chat_id)
+                            current_chat_id = chat_id
+                        batch = MessageBatch.from_database_results([row[1:] for row in run], self_contact,
+                                                                   self.timezone, senders)
+                        files.get(paths[chat_id]).write_batch(batch)
+            finally:
+                cursor.close()
+            if current_chat_id is not None:
+                finish(current_chat_id)
+
+            # Chats without messages still get an empty file, like export_conversation
+            for chat_id in paths.keys() - finished:
+                if paths[chat_id] not in files.paths:
+                    files.get(paths[chat_id])
+                finish(chat_id)
+
+        for writer in writers:
+            stats.add(writer.stats)
+        logging.info("Exported %d chats: %s", len(paths), stats)
+        return stats
+
+    def _export_to_workspace(self, chat_identifier: str, contacts_cache: Dict[str, Contact],
+                             self_contact: Contact, workspace: str) -> Optional[str]:
+        """Export a chat into a job workspace and return the path of the file written."""
+        folder_name, _ = self._conversation_folder_name(chat_identifier, contacts_cache)
+        dst_txt = os.path.join(workspace, f"{folder_name}.txt")
+        try:
+            with open(dst_txt, "w", encoding="utf-8") as f:
+                f.writelines(self.iter_export_lines(chat_identifier, contacts_cache, self_contact))
+            return dst_txt
+        except sqlite3.Error:
+            os.remove(dst_txt)
+            return self._fetch_messages_from_database(chat_identifier, contacts_cache, workspace)
+
+    def _fetch_messages_from_database(self, chat_identifier: str, contacts_cache: Dict[str, Contact],
+                                      workspace: str) -> Optional[str]:
+        """Export a chat into workspace using imessage-exporter and return the path of its file."""
         imessage_exporter_path = "lib/imessage-exporter/target/release/imessage-exporter"
-        output_path = "./dump"
+        output_path = os.path.join(workspace, "dump")
         args = [
             "-f", "txt",
             "-o", output_path,
@@ -96,42 +617,13 @@ class TextCollector:
             "-g", chat_identifier,
         ]
         command = [imessage_exporter_path] + args
+        subprocess.run(command, check=True, capture_output=True, text=True)
+        return self._find_exported_file(chat_identifier, contacts_cache, output_path)
 
-        def run_command(cmd: List[str], output_queue: queue.Queue) -> None:
-            try:
-                result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-                output_queue.put(("success", result.stdout, result.stderr))
-            except subprocess.CalledProcessError as e:
-                output_queue.put(("error", e.returncode, e.stdout, e.stderr))
-
-        output_queue = queue.Queue()
-        thread = threading.Thread(target=run_command, args=(command, output_queue))
-        thread.start()
-        thread.join()
-
-        result = output_queue.get()
-        if result[0] == "success":
-            self._process_message_results(chat_identifier, contacts_cache)
-        else:
-            raise subprocess.CalledProcessError(result[1], command, result[2], result[3])
-
-    def _process_message_results(self, chat_identifier: str, contacts_cache: Dict[str, Contact]) -> None:
-        """Process the results of the imessage-exporter command."""
-        output_path = "./dump"
-        conversations_folder = "./conversations_selected"
-
-        chat = next((c for c in self.chat_cache.values() if c.chat_identifier == chat_identifier), None)
-
-        if chat:
-            folder_name = self._sanitize_folder_name(chat.chat_name)
-            is_group_chat = len(chat.members) > 1
-        else:
-            contact = contacts_cache.get(chat_identifier, Contact(phone_number=chat_identifier, name=chat_identifier))
-            folder_name = self._sanitize_folder_name(contact.name)
-            is_group_chat = False
-
-        new_chat_folder = os.path.join(conversations_folder, folder_name)
-        os.makedirs(new_chat_folder, exist_ok=True)
+    def _find_exported_file(self, chat_identifier: str, contacts_cache: Dict[str, Contact],
+                            output_path: str) -> Optional[str]:
+        """Return the file imessage-exporter wrote for a chat, or None if there is none."""
+        folder_name, is_group_chat = self._conversation_folder_name(chat_identifier, contacts_cache)
 
         if is_group_chat:
             possible_files = [f for f in os.listdir(output_path) if f.endswith('.txt')]
@@ -143,14 +635,37 @@ class TextCollector:
         else:
             src_txt = os.path.join(output_path, f"{chat_identifier}.txt")
 
-        dst_txt = os.path.join(new_chat_folder, f"{folder_name}.txt")
+        return src_txt if os.path.exists(src_txt) else None
 
-        if os.path.exists(src_txt):
-            shutil.move(src_txt, dst_txt)
-        else:
-            pass
+    def _conversation_path(self, chat_identifier: str, contacts_cache: Dict[str, Contact]) -> str:
+        """Return the path of a chat's export in the conversations_selected folder."""
+        folder_name, _ = self._conversation_folder_name(chat_identifier, contacts_cache)
+        return os.path.join("./conversations_selected", folder_name, f"{folder_name}.txt")
+
+    def _conversation_folder_name(self, chat_identifier: str, contacts_cache: Dict[str, Contact]) -> Tuple[str, bool]:
+        """Return the conversations_selected folder name for a chat and whether it is a group chat."""
+        chat = self._chat_by_identifier(chat_identifier)
+
+        if chat:
+            return self._sanitize_folder_name(chat.chat_name), len(chat.members) > 1
+
+        contact = contacts_cache.get(chat_identifier, Contact(phone_number=chat_identifier, name=chat_identifier))
+        return self._sanitize_folder_name(contact.name), False
 
-        self._cleanup_dump_folder(output_path)
+    def _chat_by_identifier(self, chat_identifier: str) -> Optional[Chat]:
+        """Return the first chat in chat_cache with chat_identifier, or None.
+
+        The lookup map is built once per chat_cache, so computing the paths
+        of every chat in an export stays linear in the number of chats.
+        """
+        chat_cache = self.chat_cache
+        if self._chats_by_identifier_source is not chat_cache:
+            chats_by_identifier: Dict[str, Chat] = {}
+            for chat in chat_cache.values():
+                chats_by_identifier.setdefault(chat.chat_identifier, chat)
+            self._chats_by_identifier = chats_by_identifier
+            self._chats_by_identifier_source = chat_cache
+        return self._chats_by_identifier.get(chat_identifier)
 
     def _sanitize_folder_name(self, name):
         sanitized = name.replace(', ', '_').replace(' ', '_')
@@ -158,13 +673,6 @@ class TextCollector:
             sanitized = sanitized[:-3]
         return sanitized
 
-    def _cleanup_dump_folder(self, output_path: str) -> None:
-        """Delete the original ./dump folder after processing."""
-        try:
-            shutil.rmtree(output_path, ignore_errors=True)
-        except Exception:
-            pass
-
     def get_chat_members(self, chat_id: int, contacts_cache: Dict[str, Contact]) -> List[Contact]:
         """Get the members of a specific chat."""
         try:
@@ -184,9 +692,27 @@ class TextCollector:
             raise
 
     def search_chats(self, search_term: str) -> List[Chat]:
-        """Search for chats based on a search term."""
-        lowercase_search_term = search_term.lower()
-        return [chat for chat in self.chat_cache.values() if lowercase_search_term in chat.chat_name.lower().rstrip('...')]
+        """Search for chats by name, member name or phone number, best matches first."""
+        return self.chat_search_index.search(search_term)
+
+    def update_search_index(self, self_contact: Contact) -> int:
+        """Add messages received since the last update to the full-text index."""
+        if not self.search_index:
+            return 0
+        try:
+            return self.search_index.update(self.conn, self_contact)
+        except sqlite3.Error:
+            raise
+
+    def search_messages(self, query: str, self_contact: Contact, limit: int = 50) -> List[SearchHit]:
+        """Search the bodies of all messages, best matches first.
+
+        The full-text index is brought up to date before searching.
+        """
+        if not self.search_index:
+            return []
+        self.update_search_index(self_contact)
+        return self.search_index.search(query, limit)
 
     def rename_existing_files(self):
         conversations_folder = "./conversations_selected"
@@ -200,6 +726,25 @@ class TextCollector:
                         os.rename(old_file_path, new_file_path)
 
     def __del__(self):
-        """Close the database connection when the object is destroyed."""
-        if self.conn:
-            self.conn.close()
\ No newline at end of file
+        """Close the database connections when the object is destroyed."""
+        if getattr(self, "pool", None):
+            self.pool.close_all()
+        if getattr(self, "activity_index", None):
+            self.activity_index.close()
+        if getattr(self, "search_index", None):
+            self.search_index.close()
+
+
+def _copy_future_state(target: "Future[str]", source: "Future[str]") -> None:
+    """Settle target with the result or exception of source."""
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+def _fail_unsettled(futures: Dict[str, "Future[str]"], error: BaseException) -> None:
+    """Set error on every future that has no result yet."""
+    for future in futures.values():
+        if not future.done():
+            future.set_exception(error)
@@ -0,0 +1,132 @@
+"""Module for converting Apple epoch message timestamps in batches."""
+
+from datetime import datetime, timedelta, tzinfo
+from typing import Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Fall back to converting row by row
+    np = None
+
+APPLE_EPOCH = datetime(2001, 1, 1)
+DATE_FORMAT = '%Y-%m-%d %H:%M'
+# Stands for a NULL message.date in integer columns, which cannot hold None
+MISSING_TIMESTAMP = -2 ** 63
+
+_NANOSECONDS_PER_HOUR = 3600 * 1_000_000_000
+
+
+def to_datetimes(timestamps: Iterable[Optional[int]], timezone: Optional[tzinfo] = None) -> List[Optional[datetime]]:
+    """Convert a column of message.date values into naive datetimes.
+
+    Args:
+        timestamps: Nanoseconds since the Apple epoch (2001-01-01 UTC); None
+            and MISSING_TIMESTAMP become None.
+        timezone: The timezone to express the datetimes in, None for UTC.
+
+    Returns:
+        A list of datetimes, or None where the timestamp was None.
+    """
+    timestamps = list(timestamps)
+    if np is None:
+        return [_to_datetime(timestamp, timezone) for timestamp in timestamps]
+
+    values, missing = _as_array(timestamps)
+    if timezone is not None:
+        values = values + _utc_offsets(values, timezone)
+    dates = (np.datetime64(APPLE_EPOCH, 'ns') + values.astype('timedelta64[ns]')).astype('datetime64[us]').tolist()
+    if missing is not None:
+        for index in np.flatnonzero(missing):
+            dates[index] = None
+    return dates
+
+
+def format_timestamps(timestamps: Iterable[Optional[int]], timezone: Optional[tzinfo] = None) -> List[str]:
+    """Convert a column of message.date values straight into DATE_FORMAT strings.
+
+    Args:
+        timestamps: Nanoseconds since the Apple epoch; None and
+            MISSING_TIMESTAMP become "".
+        timezone: The timezone to express the dates in, None for UTC.
+
+    Returns:
+        A list of formatted dates.
+    """
+    timestamps = list(timestamps)
+    if np is None:
+        return [date.strftime(DATE_FORMAT) if date else "" for date in to_datetimes(timestamps, timezone)]
+
+    values, missing = _as_array(timestamps)
+    if timezone is not None:
+        values = values + _utc_offsets(values, timezone)
+    dates = np.datetime64(APPLE_EPOCH, 'ns') + values.astype('timedelta64[ns]')
+    return _format_minutes(dates, missing)
+
+
+def format_datetimes(dates: Iterable[Optional[datetime]]) -> List[str]:
+    """Format a column of naive datetimes with DATE_FORMAT in one step.
+
+    Args:
+        dates: The datetimes to format; None becomes "".
+
+    Returns:
+        A list of formatted dates.
+    """
+    dates = list(dates)
+    if np is None:
+        return [date.strftime(DATE_FORMAT) if date else "" for date in dates]
+
+    values = np.array(dates, dtype='datetime64[m]')
+    return _format_minutes(values, np.isnat(values))
+
+
+def _to_datetime(timestamp: Optional[int], timezone: Optional[tzinfo]) -> Optional[datetime]:
+    """Convert one timestamp; the fallback used when NumPy is unavailable."""
+    if timestamp is None or timestamp == MISSING_TIMESTAMP:
+        return None
+    date = APPLE_EPOCH + timedelta(microseconds=timestamp // 1000)
+    if timezone is not None:
+        date += _utc_offset(date, timezone)
+    return date
+
+
+def _utc_offset(utc_date: datetime, timezone: tzinfo) -> timedelta:
+    """Return the UTC offset of timezone at a naive UTC datetime."""
+    return timezone.fromutc(utc_date.replace(tzinfo=timezone)).utcoffset()
+
+
+def _as_array(timestamps: List[Optional[int]]):
+    """Return timestamps as an int64 array with missing ones replaced by 0, and the mask of those.
+
+    The mask is None when no timestamp is missing.
+    """
+    if None in timestamps:
+        timestamps = [MISSING_TIMESTAMP if timestamp is None else timestamp for timestamp in timestamps]
+    values = np.array(timestamps, dtype=np.int64)
+    missing = values == MISSING_TIMESTAMP
+    if not missing.any():
+        return values, None
+    return np.where(missing, 0, values), missing
+
+
+def _utc_offsets(values, timezone: tzinfo):
+    """Return the UTC offset of timezone at every timestamp, in nanoseconds.
+
+    Offsets only change on hour boundaries in practice, so they are looked up
+    once per distinct hour rather than once per message.
+    """
+    hours, inverse = np.unique(values // _NANOSECONDS_PER_HOUR, return_inverse=True)
+    offsets = np.array([
+        _utc_offset(APPLE_EPOCH + timedelta(hours=int(hour)), timezone) // timedelta(microseconds=1) * 1000
+        for hour in hours
+    ], dtype=np.int64)
+    return offsets[inverse]
+
+
+def _format_minutes(dates, missing) -> List[str]:
+    """Format a datetime64 array as DATE_FORMAT strings, "" where missing."""
+    formatted = np.char.replace(np.datetime_as_string(dates, unit='m'), 'T', ' ').tolist()
+    if missing is not None:
+        for index in np.flatnonzero(missing):
+            formatted[index] = ""
+    return formatted
@@ -1,14 +1,27 @@
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import ttk
 from typing import List, Set
 
 class ChatList(ttk.Frame):
+    """A list of chat names that only renders the rows on screen.
+
+    The Listbox holds just the visible rows of displayed_chats; scrolling
+    moves a window over the list and re-renders only the rows that changed,
+    so filtering, scrolling and clicking cost time proportional to what is
+    on screen rather than to the number of chats. Selection is kept in
+    selected_chats, independently of the rendered rows.
+    """
+
     def __init__(self, parent, *args, **kwargs):
         super().__init__(parent, style='ChatList.TFrame', *args, **kwargs)
-        self.create_widgets()
         self.selected_chats: Set[str] = set()
         self.all_chats: List[str] = []
         self.displayed_chats: List[str] = []
+        self._top = 0
+        self._visible_rows = 1
+        self._rendered: List[str] = []
+        self.create_widgets()
 
     def create_widgets(self):
         self.chat_listbox = tk.Listbox(
@@ -28,45 +41,44 @@ class ChatList(ttk.Frame):
         )
         self.chat_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-        chat_scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.chat_listbox.yview)
-        chat_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.chat_scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.chat_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-        self.chat_listbox.config(yscrollcommand=chat_scrollbar.set)
+        self._row_height = tkfont.Font(font=self.chat_listbox.cget("font")).metrics("linespace") + 1
         self.chat_listbox.bind('<<ListboxSelect>>', self.on_select)
+        self.chat_listbox.bind('<Configure>', self._on_resize)
+        self.chat_listbox.bind('<MouseWheel>', self._on_mouse_wheel)
+        self.chat_listbox.bind('<Button-4>', lambda event: self._scroll_by(-3))
+        self.chat_listbox.bind('<Button-5>', lambda event: self._scroll_by(3))
 
     def on_select(self, event):
-        selection = self.chat_listbox.curselection()
-        newly_selected = set(self.displayed_chats[i] for i in selection)
-        
-        # Toggle selection status
-        for chat in self.displayed_chats:
-            if chat in newly_selected and chat not in self.selected_chats:
-                self.selected_chats.add(chat)
-            elif chat not in newly_selected and chat in self.selected_chats:
-                self.selected_chats.remove(chat)
-        
-        self.selected_chats.intersection_update(set(self.all_chats))
-        
-        # Update the listbox selection to reflect the current state
-        self.update_listbox_selection()
-        
+        # Only the clicked row can have changed, and it is on screen
+        selection = set(self.chat_listbox.curselection())
+        for row, chat in enumerate(self._rendered):
+            if (row in selection) != (chat in self.selected_chats):
+                if row in selection:
+                    self.selected_chats.add(chat)
+                else:
+                    self.selected_chats.discard(chat)
+
         self.event_generate("<<SelectionComplete>>")
 
     def update_listbox_selection(self):
-        self.chat_listbox.selection_clear(0, tk.END)
-        for i, chat in enumerate(self.displayed_chats):
+        """Make the selection of the rendered rows match selected_chats."""
+        for row, chat in enumerate(self._rendered):
             if chat in self.selected_chats:
-                self.chat_listbox.selection_set(i)
+                self.chat_listbox.selection_set(row)
+            else:
+                self.chat_listbox.selection_clear(row)
 
     def display_chats(self, chats: List[str]):
         self.displayed_chats = chats
-        self.chat_listbox.delete(0, tk.END)
-        for chat in chats:
-            self.chat_listbox.insert(tk.END, chat)
-        self.update_listbox_selection()
+        self._top = 0
+        self._render()
 
     def set_all_chats(self, chats: List[str]):
         self.all_chats = chats
+        self.selected_chats.intersection_update(chats)
         self.display_chats(chats)
 
     def get_selected_chats(self) -> List[str]:
@@ -75,4 +87,50 @@ class ChatList(ttk.Frame):
     def clear_selection(self):
         self.chat_listbox.selection_clear(0, tk.END)
         self.selected_chats.clear()
-        self.event_generate("<<SelectionComplete>>")
\ No newline at end of file
+        self.event_generate("<<SelectionComplete>>")
+
+    def _render(self):
+        """Show the rows of displayed_chats from _top, replacing only the rows that changed."""
+        self._top = max(0, min(self._top, len(self.displayed_chats) - self._visible_rows))
+        rows = self.displayed_chats[self._top:self._top + self._visible_rows + 1]
+
+        if len(self._rendered) > len(rows):
+            self.chat_listbox.delete(len(rows), tk.END)
+        for row, chat in enumerate(rows):
+            if row >= len(self._rendered):
+                self.chat_listbox.insert(tk.END, chat)
+            elif self._rendered[row] != chat:
+                self.chat_listbox.delete(row)
+                self.chat_listbox.insert(row, chat)
+        self._rendered = rows
+        self.chat_listbox.yview_moveto(0)
+        self.update_listbox_selection()
+
+        total = len(self.displayed_chats)
+        if total:
+            self.chat_scrollbar.set(self._top / total, min(1.0, (self._top + self._visible_rows) / total))
+        else:
+            self.chat_scrollbar.set(0.0, 1.0)
+
+    def _scroll_by(self, rows: int):
+        self._top += rows
+        self._render()
+        return "break"
+
+    def _on_scrollbar(self, *args):
+        """Move the window over the list from the scrollbar, whose range is every displayed chat."""
+        if args[0] == "moveto":
+            self._top = int(float(args[1]) * len(self.displayed_chats))
+            self._render()
+        elif args[0] == "scroll":
+            step = self._visible_rows if args[2] == "pages" else 1
+            self._scroll_by(int(args[1]) * step)
+
+    def _on_mouse_wheel(self, event):
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_resize(self, event):
+        visible_rows = max(1, event.height // self._row_height)
+        if visible_rows != self._visible_rows:
+            self._visible_rows = visible_rows
+            self._render()
@@ -1,6 +1,23 @@
 import tkinter as tk
 from tkinter import ttk
 import math
+import re
+import time
+from .mapped_text_file import MappedTextFile
+from .name_match_index import NameMatchIndex
+
+# Lines of a file kept in the text widget around the visible region
+WINDOW_LINES = 3000
+# Distance from the edge of the window at which the window is moved
+WINDOW_MARGIN = 500
+# Lines inserted into the text widget at once while rendering progressively
+RENDER_CHUNK_LINES = 200
+# Time spent inserting text per frame before yielding to the event loop, in seconds
+RENDER_FRAME_BUDGET = 0.008
+# Lines tagged together when highlighting the visible region
+HIGHLIGHT_BLOCK_LINES = 100
+
+_ASTRAL_CHARACTERS = re.compile("[\U00010000-\U0010FFFF]")
 
 class ChatView(ttk.Frame):
     """A custom widget for displaying an empty canvas with loading animation."""
@@ -14,7 +31,15 @@ class ChatView(ttk.Frame):
         self.angle_increment = 15  # Increased from 10 to 15
         self.animation_delay = 10  # Decreased from 50 to 30 milliseconds
         self.highlighted_names = set()
-        self.content = ""
+        self.file = None
+        self._window_start = 0
+        self._window_end = 0
+        self._recenter_pending = False
+        self._render_chunks = []
+        self._render_job = None
+        self._matches = NameMatchIndex()
+        self._tagged_blocks = set()
+        self._astral_counts_double = float(self.tk.call("info", "tclversion")) < 8.7
 
     def _create_widgets(self):
         """Create and configure the widgets for the chat view."""
@@ -28,17 +53,21 @@ class ChatView(ttk.Frame):
         # Configure text tags for highlighting
         self.text_widget.tag_configure("highlighted", background="#4CAF50", foreground="white")
 
-        # Add a custom scrollbar
-        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.text_widget.yview)
-        self.text_widget.configure(yscrollcommand=self.scrollbar.set)
+        # Add a custom scrollbar; it spans the whole file, not just the lines in the widget
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.text_widget.configure(yscrollcommand=self._on_text_scroll)
 
     def clear(self):
         """Clear the canvas."""
+        self._cancel_render()
         self.canvas.delete("all")
         self.text_widget.delete(1.0, tk.END)
         self.canvas.pack(fill=tk.BOTH, expand=True)
         self.text_widget.pack_forget()
         self.highlighted_names.clear()
+        self._matches.clear()
+        self._index_text("")
+        self._close_file()
 
     def start_loading_animation(self):
         """Start the loading animation."""
@@ -91,41 +120,196 @@ class ChatView(ttk.Frame):
 
     def show_file_content(self, content):
         """Display the content of a file in the text widget."""
-        self.content = content
         self.clear()
+        self._show_text_widget()
+        self.text_widget.delete(1.0, tk.END)
+        self._render_progressively(content)
+
+    def show_file(self, path):
+        """Display a text file of any size, starting at its end.
+
+        The file is memory-mapped and only a window of WINDOW_LINES lines
+        around the visible region is kept in the text widget; the window
+        moves as the view scrolls towards either of its edges.
+        """
+        self.clear()
+        self.file = MappedTextFile(path)
+        self._show_text_widget()
+        self._load_window(self.file.line_count - WINDOW_LINES, progressive=True)
+
+    def _show_text_widget(self):
+        """Replace the canvas with the text widget and its scrollbar."""
         self.canvas.pack_forget()
         self.text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def _close_file(self):
+        """Release the mapped file, if any."""
+        if self.file:
+            self.file.close()
+            self.file = None
+        self._window_start = self._window_end = 0
+
+    def _load_window(self, start, progressive=False):
+        """Fill the text widget with WINDOW_LINES lines of the file from start."""
+        self._cancel_render()
+        total = self.file.line_count
+        start = max(0, min(start, total - WINDOW_LINES))
+        end = min(total, start + WINDOW_LINES)
         self.text_widget.delete(1.0, tk.END)
-        self.text_widget.insert(tk.END, content)
-        self.apply_highlighting()
-        self.text_widget.see(tk.END)  # Scroll to the end of the content
+        self._window_start, self._window_end = start, end
+        if progressive:
+            self._render_progressively(self.file.lines(start, end))
+        else:
+            text = self.file.lines(start, end)
+            self.text_widget.insert(tk.END, text)
+            self._index_text(text)
+            self._highlight_visible()
+
+    def _render_progressively(self, text):
+        """Insert text into the empty text widget over several frames, newest lines first.
+
+        Chunks of RENDER_CHUNK_LINES lines are prepended from the end of text
+        for up to RENDER_FRAME_BUDGET per frame, so the end of the
+        conversation shows at once and the event loop stays responsive.
+        """
+        self._cancel_render()
+        self._index_text(text)
+        lines = text.splitlines(keepends=True)
+        self._render_chunks = [
+            "".join(lines[start:start + RENDER_CHUNK_LINES])
+            for start in range(0, len(lines), RENDER_CHUNK_LINES)
+        ]
+        self._render_next_frame()
+
+    def _render_next_frame(self):
+        """Insert chunks until the frame budget is spent and schedule the next frame."""
+        self._render_job = None
+        following_end = self.text_widget.yview()[1] >= 1.0
+        deadline = time.perf_counter() + RENDER_FRAME_BUDGET
+        while self._render_chunks and time.perf_counter() < deadline:
+            self.text_widget.insert("1.0", self._render_chunks.pop())
+        if following_end:
+            self.text_widget.see(tk.END)
+
+        if self._render_chunks:
+            self._render_job = self.after(1, self._render_next_frame)
+        else:
+            self._highlight_visible()
+
+    def _cancel_render(self):
+        """Stop a progressive render in progress, e.g. when another file is selected."""
+        if self._render_job is not None:
+            self.after_cancel(self._render_job)
+            self._render_job = None
+        self._render_chunks = []
+
+    def _scroll_to_line(self, line):
+        """Show a line of the file at the top of the view, moving the window if needed."""
+        self._recenter_pending = False
+        if self.file is None:
+            return
+        total = self.file.line_count
+        line = max(0, min(line, total - 1))
+        near_start = line < self._window_start + WINDOW_MARGIN and self._window_start > 0
+        near_end = line >= self._window_end - WINDOW_MARGIN and self._window_end < total
+        if near_start or near_end or not self._window_start <= line < self._window_end:
+            self._load_window(line - WINDOW_LINES // 2)
+        self.text_widget.yview(f"{line - self._window_start + 1}.0")
+
+    def _on_scrollbar(self, *args):
+        """Scroll the view from the scrollbar, whose range is the whole file."""
+        if self.file is not None and args[0] == "moveto":
+            self._scroll_to_line(int(float(args[1]) * self.file.line_count))
+        else:
+            self.text_widget.yview(*args)
+
+    def _on_text_scroll(self, first, last):
+        """Map the view of the window onto the whole file and move the window near its edges."""
+        if self.file is None or not self.file.line_count:
+            self.scrollbar.set(first, last)
+            self._highlight_visible()
+            return
+        total = self.file.line_count
+        window_lines = self._window_end - self._window_start
+        top = self._window_start + float(first) * window_lines
+        bottom = self._window_start + float(last) * window_lines
+        self.scrollbar.set(top / total, bottom / total)
+        self._highlight_visible()
+
+        near_start = top < self._window_start + WINDOW_MARGIN and self._window_start > 0
+        near_end = bottom > self._window_end - WINDOW_MARGIN and self._window_end < total
+        rendering = self._render_job is not None
+        if (near_start or near_end) and not self._recenter_pending and not rendering:
+            self._recenter_pending = True
+            self.after_idle(self._scroll_to_line, int(top))
 
     def apply_highlighting(self):
+        """Re-tag the visible matches of every highlighted name."""
         self.text_widget.tag_remove("highlighted", "1.0", tk.END)
-        for name in self.highlighted_names:
-            self.highlight_name(name)
+        self._tagged_blocks.clear()
+        self._highlight_visible()
 
     def highlight_name(self, name):
-        start = "1.0"
-        while True:
-            start = self.text_widget.search(name, start, stopindex=tk.END, nocase=True)
-            if not start:
-                break
-            end = f"{start}+{len(name)}c"
-            self.text_widget.tag_add("highlighted", start, end)
-            start = end
+        """Highlight a name in addition to those already highlighted."""
+        self.update_highlighted_names(self.highlighted_names | {name})
 
     def update_highlighted_names(self, selected_names):
-        self.highlighted_names = set(selected_names)
-        if self.content:
+        """Highlight selected_names, scanning the content only for names that were not highlighted yet."""
+        selected_names = set(selected_names)
+        added = selected_names - self.highlighted_names
+        removed = self.highlighted_names - selected_names
+        self.highlighted_names = selected_names
+        self._matches.remove_names(removed)
+        self._matches.add_names(added)
+        if removed:
             self.apply_highlighting()
+        elif added:
+            # Only the new names need tagging in the regions tagged so far
+            for block in self._tagged_blocks:
+                self._tag_spans(self._matches.spans(block * HIGHLIGHT_BLOCK_LINES,
+                                                    (block + 1) * HIGHLIGHT_BLOCK_LINES - 1, added))
+            self._highlight_visible()
 
     def reset_highlights(self):
         """Reset only the highlighted names without clearing the content."""
         self.highlighted_names.clear()
+        self._matches.clear()
         self.text_widget.tag_remove("highlighted", "1.0", tk.END)
 
+    def _index_text(self, text):
+        """Index the matches of the highlighted names in the text being shown."""
+        self._matches.set_text(text)
+        self._tagged_blocks.clear()
+
+    def _highlight_visible(self):
+        """Tag the matches in the blocks of lines on screen that are not tagged yet."""
+        if not self.highlighted_names or self._render_job is not None:
+            return
+        first = int(self.text_widget.index("@0,0").split(".")[0]) - 1
+        last = int(self.text_widget.index(f"@0,{self.text_widget.winfo_height()}").split(".")[0]) - 1
+        for block in range(first // HIGHLIGHT_BLOCK_LINES, last // HIGHLIGHT_BLOCK_LINES + 1):
+            if block not in self._tagged_blocks:
+                self._tagged_blocks.add(block)
+                self._tag_spans(self._matches.spans(block * HIGHLIGHT_BLOCK_LINES,
+                                                    (block + 1) * HIGHLIGHT_BLOCK_LINES - 1))
+
+    def _tag_spans(self, spans):
+        """Add the highlighted tag to every (line, start, end) span in a single Tk call."""
+        indices = []
+        for line, start, end in spans:
+            indices.append(self._tk_index(line, start))
+            indices.append(self._tk_index(line, end))
+        if indices:
+            self.text_widget.tag_add("highlighted", *indices)
+
+    def _tk_index(self, line, column):
+        """Convert a line and column of the indexed text into a text widget index."""
+        if self._astral_counts_double:
+            # Tcl 8.6 counts characters outside the BMP as two
+            column += len(_ASTRAL_CHARACTERS.findall(self._matches.line(line), 0, column))
+        return f"{line + 1}.{column}"
+
     def hide_file_content(self):
         """Hide the text widget and show the canvas."""
         self.text_widget.pack_forget()
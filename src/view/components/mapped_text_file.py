@@ -0,0 +1,74 @@
+"""Module containing MappedTextFile, random access to the lines of a large text file."""
+
+import mmap
+import os
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # Fall back to finding line breaks one at a time
+    np = None
+
+# Bytes of the file searched for line breaks at a time when building the index
+INDEX_SLICE_BYTES = 16 * 1024 * 1024
+
+
+class MappedTextFile:
+    """A UTF-8 text file mapped into memory with an index of its line offsets.
+
+    Only the index lives in Python memory (8 bytes per line); the text is
+    paged in by the OS as lines are read, so opening a large export is cheap
+    and reading any range of lines costs time proportional to that range.
+
+    Attributes:
+        path: The path of the file.
+        offsets: The byte offset where every line starts, followed by the file size.
+    """
+
+    def __init__(self, path: str):
+        """Map the file and index its lines."""
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.offsets = self._index_lines(size)
+
+    def _index_lines(self, size: int) -> array:
+        """Return the start offset of every line, followed by the file size."""
+        offsets = array('q', [0])
+        if not size:
+            return offsets
+        if np is not None:
+            # Scan in slices so the temporary comparison array stays small however large the file is
+            for start in range(0, size, INDEX_SLICE_BYTES):
+                chunk = np.frombuffer(self._map, dtype=np.uint8, count=min(INDEX_SLICE_BYTES, size - start),
+                                      offset=start)
+                breaks = np.flatnonzero(chunk == ord("\n")) + (start + 1)
+                offsets.frombytes(breaks.astype(np.int64).tobytes())
+        else:
+            position = self._map.find(b"\n")
+            while position != -1:
+                offsets.append(position + 1)
+                position = self._map.find(b"\n", position + 1)
+        if offsets[-1] != size:
+            offsets.append(size)  # Last line without a trailing newline
+        return offsets
+
+    @property
+    def line_count(self) -> int:
+        """Returns the number of lines in the file."""
+        return len(self.offsets) - 1
+
+    def lines(self, start: int, stop: int) -> str:
+        """Return lines start (inclusive) to stop (exclusive) as one string."""
+        start = max(0, min(start, self.line_count))
+        stop = max(start, min(stop, self.line_count))
+        if start == stop:
+            return ""
+        return self._map[self.offsets[start]:self.offsets[stop]].decode("utf-8", errors="replace")
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
@@ -0,0 +1,97 @@
+"""Module containing NameMatchIndex, the positions of names in a text."""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Tuple
+
+
+class NameMatchIndex:
+    """Finds every occurrence of a set of names in a text and indexes them by line.
+
+    Names are matched case-insensitively with one compiled regex that
+    alternates all newly added names, so the text is scanned once per
+    update rather than once per name. Matches are kept per name, which lets
+    names be added or removed without rescanning for the others.
+    """
+
+    def __init__(self):
+        """Initialize an empty NameMatchIndex."""
+        self._text = ""
+        self._line_starts = array('q', [0])
+        # name -> (line of every match, start column, end column), in text order
+        self._matches: Dict[str, Tuple[array, array, array]] = {}
+
+    def set_text(self, text: str) -> None:
+        """Index a new text, rescanning it for the names already added."""
+        self._text = text
+        self._line_starts = array('q', [0])
+        self._line_starts.extend(match.end() for match in re.finditer("\n", text))
+        names = list(self._matches)
+        self._matches.clear()
+        self.add_names(names)
+
+    @property
+    def names(self) -> List[str]:
+        """Returns the indexed names."""
+        return list(self._matches)
+
+    def add_names(self, names: Iterable[str]) -> None:
+        """Find the occurrences of names not indexed yet with a single scan."""
+        new_names = {name for name in names if name and name not in self._matches}
+        if not new_names:
+            return
+        by_lower: Dict[str, List[str]] = {}
+        for name in new_names:
+            by_lower.setdefault(name.lower(), []).append(name)
+            self._matches[name] = (array('q'), array('q'), array('q'))
+
+        # Longest first so a name that starts with another is matched whole
+        pattern = re.compile("|".join(re.escape(name) for name in sorted(by_lower, key=len, reverse=True)),
+                             re.IGNORECASE)
+        line_starts = self._line_starts
+        line = 0
+        for match in pattern.finditer(self._text):
+            start, end = match.span()
+            line = bisect_right(line_starts, start, line) - 1
+            column = start - line_starts[line]
+            for name in by_lower.get(match.group().lower(), ()):
+                lines, starts, ends = self._matches[name]
+                lines.append(line)
+                starts.append(column)
+                ends.append(column + end - start)
+
+    def remove_names(self, names: Iterable[str]) -> None:
+        """Forget the occurrences of names."""
+        removed = [name.lower() for name in names if self._matches.pop(name, None) is not None]
+        # A name contained in a removed one may have been matched as part of it; find it again alone
+        shadowed = [name for name in self._matches if any(name.lower() in other for other in removed)]
+        for name in shadowed:
+            del self._matches[name]
+        self.add_names(shadowed)
+
+    def clear(self) -> None:
+        """Forget every name."""
+        self._matches.clear()
+
+    def spans(self, first_line: int, last_line: int, names: Iterable[str] = None) -> List[Tuple[int, int, int]]:
+        """Return the (line, start column, end column) of matches on lines first_line to last_line.
+
+        Lines are numbered from 0 and the range is inclusive. Only the matches
+        of names are returned when given, otherwise those of every name.
+        """
+        spans = []
+        for name in (self._matches if names is None else names):
+            if name not in self._matches:
+                continue
+            lines, starts, ends = self._matches[name]
+            low = bisect_left(lines, first_line)
+            high = bisect_right(lines, last_line)
+            spans.extend(zip(lines[low:high], starts[low:high], ends[low:high]))
+        return spans
+
+    def line(self, number: int) -> str:
+        """Return line number of the text, numbered from 0."""
+        start = self._line_starts[number]
+        end = self._line_starts[number + 1] - 1 if number + 1 < len(self._line_starts) else len(self._text)
+        return self._text[start:end]
@@ -71,6 +71,9 @@ class Settings(ttk.Frame):
         self.tree.column("ChatName", anchor="w", width=200)
         self.tree.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
 
+        self.tree.tag_configure("exported", foreground="#4CAF50")
+        self.tree.tag_configure("failed", foreground="#F44336")
+
         self.scrollbar = ttk.Scrollbar(self.chat_frame, orient="vertical", command=self.tree.yview)
         self.tree.configure(yscrollcommand=self.scrollbar.set)
         self.scrollbar.pack(side=tk.RIGHT, fill="y")
@@ -91,6 +94,12 @@ class Settings(ttk.Frame):
                 self.tree.insert("", "end", iid=chat_name, values=(chat_name,))
                 self.chat_cache[chat_name] = True
 
+    def set_export_status(self, chat_name: str, succeeded: bool):
+        """Mark a selected chat as exported or failed."""
+        if chat_name in self.chat_cache:
+            mark = "\u2713" if succeeded else "\u2717 export failed"
+            self.tree.item(chat_name, values=(f"{chat_name}  {mark}",), tags=("exported" if succeeded else "failed",))
+
     def get_displayed_chats(self) -> List[str]:
         """Retrieve the list of chat names currently displayed in the Treeview."""
         return list(self.chat_cache.keys())